@@ -1,17 +1,40 @@
 import sqlite3
 
+from connection_pool import get_pool
+from tuning import apply_profile
+
 # --- Class-based context manager ---
 class DatabaseConnection:
-    def __init__(self, db_name):
+    """
+    Opens a connection for the with-block and closes it afterwards.
+    With pooled=True, a warm connection is leased from the database's
+    shared pool (or `pool`) instead, and handed back on exit after
+    rolling back anything left uncommitted.
+    `profile` names a tuning profile (see tuning.PROFILES) for new connections.
+    """
+
+    def __init__(self, db_name, pooled=False, pool=None, profile=None):
         self.db_name = db_name
+        self.profile = profile
+        self.pool = pool if pool is not None else get_pool(db_name, profile) if pooled else None
         self.conn = None
 
     def __enter__(self):
+        if self.pool is not None:
+            # Lease a connection that is already open
+            self.conn = self.pool.acquire()
+            return self.conn
         # Open the connection when entering the context
-        self.conn = sqlite3.connect(self.db_name)
+        self.conn = apply_profile(sqlite3.connect(self.db_name), self.profile)
         return self.conn
 
     def __exit__(self, exc_type, exc_value, traceback):
+        if self.pool is not None:
+            # Hand the connection back in a clean state
+            if self.conn:
+                self.pool.release(self.conn)
+                self.conn = None
+            return False
         # Close the connection when leaving the context
         if self.conn:
             self.conn.close()
@@ -26,3 +49,9 @@ with DatabaseConnection('users.db') as conn:
     cursor.execute("SELECT * FROM users")
     results = cursor.fetchall()
     print(results)
+
+
+# --- Using a pooled connection (cheap to repeat) ---
+for _ in range(3):
+    with DatabaseConnection('users.db', pooled=True, profile='read-heavy') as conn:
+        print(conn.execute("SELECT COUNT(*) FROM users").fetchone())
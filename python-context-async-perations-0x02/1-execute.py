@@ -1,25 +1,106 @@
 import sqlite3
+from collections import namedtuple
+from functools import lru_cache
+
+from tuning import apply_profile
+
+
+# --- Row factories ---
+@lru_cache(maxsize=128)
+def namedtuple_row_type(names):
+    # rename=True turns names that aren't identifiers into _0, _1, ...
+    return namedtuple('Row', names, rename=True)
+
+
+@lru_cache(maxsize=128)
+def slotted_row_type(names):
+    fields = namedtuple_row_type(names)._fields
+
+    def __init__(self, *values):
+        for field, value in zip(fields, values):
+            setattr(self, field, value)
+
+    def __repr__(self):
+        values = ', '.join(f"{field}={getattr(self, field)!r}" for field in fields)
+        return f"Row({values})"
+
+    return type('Row', (), {'__slots__': fields, '__init__': __init__, '__repr__': __repr__})
+
+
+ROW_TYPES = {
+    'namedtuple': namedtuple_row_type,
+    'slots': slotted_row_type,
+}
+
 
 # --- Class-based context manager for executing queries ---
 class ExecuteQuery:
-    def __init__(self, db_name, query, params=None):
+    """
+    Runs a query and hands its rows to the with-block.
+    - stream=False: a list of all rows (fetched up front).
+    - stream=True: a lazy iterator fetching `arraysize` rows at a time;
+      the cursor stays open until the block exits.
+    - row_factory: 'tuple' (default), 'namedtuple', 'slots' (objects with
+      __slots__, lighter than dicts), or a callable taking (cursor, row).
+    - profile: tuning profile (see tuning.PROFILES) for the connection.
+    """
+
+    def __init__(self, db_name, query, params=None, stream=False, arraysize=1000,
+                 row_factory='tuple', profile=None):
         self.db_name = db_name
         self.query = query
         self.params = params if params is not None else ()
+        self.stream = stream
+        self.arraysize = arraysize
+        self.row_factory = row_factory
+        self.profile = profile
         self.conn = None
         self.cursor = None
         self.results = None
 
+    def _make_row(self):
+        # Returns a function turning a fetched tuple into a row, or None
+        factory = self.row_factory
+        if factory in (None, 'tuple'):
+            return None
+        if callable(factory):
+            cursor = self.cursor
+            return lambda row: factory(cursor, row)
+        names = tuple(description[0] for description in self.cursor.description or ())
+        row_type = ROW_TYPES[factory](names)
+        return lambda row: row_type(*row)
+
+    def _iter_rows(self):
+        cursor = self.cursor
+        make_row = self._make_row()
+        while True:
+            rows = cursor.fetchmany(self.arraysize)
+            if not rows:
+                return
+            if make_row is None:
+                yield from rows
+            else:
+                yield from map(make_row, rows)
+
     def __enter__(self):
         # Open database connection
-        self.conn = sqlite3.connect(self.db_name)
+        self.conn = apply_profile(sqlite3.connect(self.db_name), self.profile)
         self.cursor = self.conn.cursor()
+        self.cursor.arraysize = self.arraysize
 
         # Execute the provided query with parameters
         self.cursor.execute(self.query, self.params)
 
+        if self.stream:
+            # Rows are fetched lazily while the with-block iterates
+            self.results = self._iter_rows()
+            return self.results
+
         # Fetch all results
         self.results = self.cursor.fetchall()
+        make_row = self._make_row()
+        if make_row is not None:
+            self.results = [make_row(row) for row in self.results]
 
         # Return the results to the with-block
         return self.results
@@ -41,3 +122,9 @@ params = (25,)
 
 with ExecuteQuery('users.db', query, params) as results:
     print(results)
+
+# --- Streaming rows as namedtuples, 500 at a time ---
+with ExecuteQuery('users.db', query, params, stream=True, arraysize=500,
+                  row_factory='namedtuple', profile='read-heavy') as rows:
+    for row in rows:
+        print(row)
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from tuning import PROFILES, apply_profile
+
+
+# --- Workloads (each returns operations per second) ---
+def bulk_load(path, profile, rows):
+    conn = apply_profile(sqlite3.connect(path), profile)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+    conn.execute("CREATE INDEX idx_age ON users (age)")
+    start = time.perf_counter()
+    for offset in range(0, rows, 10_000):
+        conn.executemany(
+            "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+            ((f"User {i}", f"user{i}@example.com", 18 + i % 80)
+             for i in range(offset, min(offset + 10_000, rows)))
+        )
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return rows / elapsed
+
+
+def small_writes(path, profile, rows, count):
+    # One single-row transaction per call, like update_user_email
+    conn = apply_profile(sqlite3.connect(path), profile)
+    start = time.perf_counter()
+    for i in range(count):
+        conn.execute("UPDATE users SET email = ? WHERE id = ?", (f"new{i}@example.com", i % rows + 1))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return count / elapsed
+
+
+def range_reads(path, profile, count):
+    conn = apply_profile(sqlite3.connect(path), profile)
+    start = time.perf_counter()
+    for i in range(count):
+        conn.execute("SELECT * FROM users WHERE age > ? LIMIT 500", (18 + i % 80,)).fetchall()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of each SQLite tuning profile.")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--writes', type=int, default=2_000)
+    parser.add_argument('--reads', type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'load rows/s':>12} {'writes/s':>10} {'reads/s':>9}")
+    for name in ('none', *PROFILES):
+        profile = None if name == 'none' else name
+        # Fresh database per profile, since journal_mode sticks to the file
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.db')
+            load = bulk_load(path, profile, args.rows)
+            writes = small_writes(path, profile, args.rows, args.writes)
+            reads = range_reads(path, profile, args.reads)
+        print(f"{name:>12} {load:>12,.0f} {writes:>10,.0f} {reads:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import warnings
+import weakref
+
+from tuning import apply_profile
+
+
+class ConnectionPool:
+    """
+    Bounded pool of warm SQLite connections to one database file.
+    - size: maximum open connections; acquire() waits up to
+      `acquire_timeout` seconds for one, then raises TimeoutError.
+    - idle_timeout: connections unused for longer are closed.
+    - leak_timeout: a connection leased for longer is reported once with
+      a RuntimeWarning showing where it was acquired.
+    - A background thread runs both checks every half of the shorter
+      timeout, so quiet processes close idle connections and report
+      leaks too; either timeout can be None to turn its check off.
+    - Released connections are rolled back if a transaction is still open.
+    - profile: tuning profile (see tuning.PROFILES) run on each new connection.
+    """
+
+    def __init__(self, database, size=5, idle_timeout=60, leak_timeout=30,
+                 acquire_timeout=10, profile=None):
+        self.database = database
+        self.profile = profile
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.leak_timeout = leak_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle = []     # (conn, released_at), most recently used last
+        # id(conn) -> (conn, leased_at, acquiring stack); holding the
+        # connection keeps a leaked one (and its id) from being recycled
+        self._leases = {}
+        self._reported = set()
+        self._opened = 0
+        self._available = threading.Condition()
+        timeouts = [t for t in (idle_timeout, leak_timeout) if t is not None]
+        if timeouts:
+            threading.Thread(target=_watch, args=(weakref.ref(self), min(timeouts) / 2),
+                             name='pool-watch', daemon=True).start()
+
+    def _open(self):
+        # Leases may be released from another thread than the one that opened them
+        return apply_profile(sqlite3.connect(self.database, check_same_thread=False),
+                             self.profile)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._available:
+            while True:
+                now = time.monotonic()
+                self._close_expired(now)
+                self._report_leaks(now)
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    conn = None
+                    break
+                if now >= deadline:
+                    raise TimeoutError(
+                        f"no connection to {self.database} available "
+                        f"({len(self._leases)} leased, size={self.size})")
+                self._available.wait(deadline - now)
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except sqlite3.Error:
+                with self._available:
+                    self._opened -= 1
+                    self._available.notify()
+                raise
+
+        with self._available:
+            # Source lines are only looked up if a leak is reported
+            stack = traceback.StackSummary.extract(
+                traceback.walk_stack(sys._getframe(1)), limit=8, lookup_lines=False)
+            self._leases[id(conn)] = (conn, time.monotonic(), stack)
+        return conn
+
+    def release(self, conn):
+        """Returns a leased connection, rolling back any open transaction."""
+        with self._available:
+            if self._leases.pop(id(conn), None) is None:
+                raise ValueError("connection was not leased from this pool")
+            self._reported.discard(id(conn))
+            self._report_leaks(time.monotonic())
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Not safe to hand out again
+            conn.close()
+            with self._available:
+                self._opened -= 1
+                self._available.notify()
+            return
+        with self._available:
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    def _close_expired(self, now):
+        if self.idle_timeout is None:
+            return
+        # Oldest idle connections are at the front
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            self._idle.pop(0)[0].close()
+            self._opened -= 1
+
+    def _report_leaks(self, now):
+        if self.leak_timeout is None:
+            return
+        for key, (_, leased_at, stack) in self._leases.items():
+            if key not in self._reported and now - leased_at > self.leak_timeout:
+                self._reported.add(key)
+                warnings.warn(
+                    f"connection to {self.database} leased for {now - leased_at:.1f}s "
+                    f"without being released; acquired at:\n{''.join(reversed(stack.format()))}",
+                    RuntimeWarning, stacklevel=2)
+
+    @property
+    def leased(self):
+        return len(self._leases)
+
+    def close(self):
+        """Closes all idle connections."""
+        with self._available:
+            for conn, _ in self._idle:
+                conn.close()
+                self._opened -= 1
+            self._idle.clear()
+
+
+def _watch(pool_ref, interval):
+    # Holds only a weak reference, so an unused pool can still be collected
+    while True:
+        time.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        with pool._available:
+            now = time.monotonic()
+            pool._close_expired(now)
+            pool._report_leaks(now)
+        del pool
+
+
+# One pool per database file and profile
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database, profile=None, **options):
+    """Returns the shared pool for `database`, creating it on first use."""
+    key = (os.path.abspath(database), profile)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(database, profile=profile, **options)
+        return pool
@@ -0,0 +1 @@
+../python-decorators-0x01/tuning.py
\ No newline at end of file
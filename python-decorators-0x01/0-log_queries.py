@@ -1,24 +1,53 @@
 import sqlite3
 import functools
-from datetime import datetime
+import logging
+import time
+
+from query_metrics import FanoutSink, HistogramSink, QueryRecord, QueuedLogSink
+from tuning import busy_timeout
+
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(message)s")
+
+# Default instrumentation: every call goes into the histogram; the log
+# gets a sample of calls plus every slow (>= 100 ms) or failed one
+query_histogram = HistogramSink()
+query_log = QueuedLogSink(sample_rate=1.0, slow_threshold=0.1)
+default_sink = FanoutSink(query_histogram, query_log)
+
 
 #### decorator to log SQL queries
-def log_queries(func):
+def log_queries(func=None, *, sink=None):
+    """
+    Times each call and reports query, duration, row count (for list
+    results, else None) and outcome to a sink (default: histogram +
+    queued log). Usable bare (@log_queries) or with a sink
+    (@log_queries(sink=...)).
+    """
+    if func is None:
+        return functools.partial(log_queries, sink=sink)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         query = kwargs.get('query') if 'query' in kwargs else args[0] if args else None
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if query:
-            print(f"[{timestamp}] Executing SQL Query: {query}")
-        else:
-            print(f"[{timestamp}] No SQL query provided.")
-        return func(*args, **kwargs)
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            (sink or default_sink).record(QueryRecord(
+                query, time.perf_counter() - start, None, 'error', repr(e), started_at))
+            raise
+        # fetchall() returns a list; a single row (fetchone) is a tuple
+        rows = len(result) if isinstance(result, list) else None
+        (sink or default_sink).record(QueryRecord(
+            query, time.perf_counter() - start, rows, 'ok', None, started_at))
+        return result
     return wrapper
 
 
 @log_queries
 def fetch_all_users(query):
-    conn = sqlite3.connect('users.db')
+    conn = sqlite3.connect('users.db', timeout=busy_timeout('read-heavy'))
     cursor = conn.cursor()
     cursor.execute(query)
     results = cursor.fetchall()
@@ -28,3 +57,4 @@ def fetch_all_users(query):
 
 #### fetch users while logging the query
 users = fetch_all_users(query="SELECT * FROM users")
+print(query_histogram.summary())
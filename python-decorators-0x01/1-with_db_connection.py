@@ -1,11 +1,14 @@
 import sqlite3
 import functools
 
+from db_pool import SQLitePool
+from tuning import busy_timeout
+
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        # Open the database connection
-        conn = sqlite3.connect('users.db')
+        # Open the database connection (waits out a writer's lock)
+        conn = sqlite3.connect('users.db', timeout=busy_timeout('read-heavy'))
         try:
             # Pass the connection as the first argument
             result = func(conn, *args, **kwargs)
@@ -16,7 +19,25 @@ def with_db_connection(func):
     return wrapper
 
 
-@with_db_connection
+# Shared pool for high-frequency lookups
+users_pool = SQLitePool('users.db', size=5, profile='read-heavy')
+
+
+def with_pooled_db_connection(pool=None):
+    """
+    Like with_db_connection, but borrows a warm connection from a pool
+    instead of connecting on every call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with (pool or users_pool).connection() as conn:
+                return func(conn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@with_pooled_db_connection()
 def get_user_by_id(conn, user_id):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
@@ -26,3 +47,4 @@ def get_user_by_id(conn, user_id):
 #### Fetch user by ID with automatic connection handling
 user = get_user_by_id(user_id=1)
 print(user)
+print(users_pool.stats)
@@ -1,11 +1,20 @@
 import sqlite3
 import functools
+from itertools import islice
+
+from cache_store import invalidate_tables, tables_written
+from tuning import busy_timeout
+from group_commit import GroupCommit, current_group
 
 # Reuse previous decorator
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
+        # Inside a GroupCommit scope, share its connection and transaction
+        group = current_group()
+        if group is not None and group.database == 'users.db':
+            return func(group.conn, *args, **kwargs)
+        conn = sqlite3.connect('users.db', timeout=busy_timeout('write-heavy'))
         try:
             result = func(conn, *args, **kwargs)
         finally:
@@ -13,18 +22,45 @@ def with_db_connection(func):
         return result
     return wrapper
 
+# Tables written by the transactional calls running on each connection,
+# keyed by id(conn), innermost call last
+_write_frames = {}
+
 # New decorator for handling transactions
 def transactional(func):
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
+        group = current_group()
+        if group is not None and conn is group.conn:
+            # Group-commit mode: a savepoint now, the commit comes later
+            return group.run(func, *args, **kwargs)
+        # Record which tables the transaction writes to. Nested calls on
+        # the same connection push their own set; the outermost call owns
+        # the one trace callback, which records into the innermost set
+        frames = _write_frames.get(id(conn))
+        outermost = frames is None
+        if outermost:
+            frames = _write_frames[id(conn)] = []
+            conn.set_trace_callback(lambda sql: frames[-1].update(tables_written(sql)))
+        frames.append(set())
         try:
             result = func(conn, *args, **kwargs)
             conn.commit()  # ✅ Commit if successful
-            return result
         except Exception as e:
             conn.rollback()  # ❌ Roll back if there’s an error
             print(f"Transaction failed: {e}")
             raise e
+        finally:
+            written = frames.pop()
+            if outermost:
+                conn.set_trace_callback(None)
+                del _write_frames[id(conn)]
+            else:
+                frames[-1] |= written
+        # Cached reads of those tables are now stale
+        if written:
+            invalidate_tables(written)
+        return result
     return wrapper
 
 
@@ -35,5 +71,54 @@ def update_user_email(conn, user_id, new_email):
     cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
 
 
+# UPDATE ... FROM needs SQLite 3.33+; older versions use a correlated subquery
+if sqlite3.sqlite_version_info >= (3, 33, 0):
+    APPLY_EMAIL_CHANGES = """
+        UPDATE users SET email = email_changes.email
+        FROM email_changes WHERE users.id = email_changes.id
+    """
+else:
+    APPLY_EMAIL_CHANGES = """
+        UPDATE users SET email = (SELECT email FROM email_changes WHERE email_changes.id = users.id)
+        WHERE id IN (SELECT id FROM email_changes)
+    """
+
+
+@with_db_connection
+@transactional
+def update_user_emails(conn, changes, chunk_size=10_000):
+    """
+    Bulk version of update_user_email: stages the (user_id, new_email)
+    pairs in a temp table, then applies them with one set-based UPDATE.
+    The last email given for an id wins. Returns the number of users updated.
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS email_changes (id INTEGER PRIMARY KEY, email TEXT)")
+    conn.execute("DELETE FROM email_changes")
+    changes = iter(changes)
+    while True:
+        chunk = list(islice(changes, chunk_size))
+        if not chunk:
+            break
+        conn.executemany("INSERT OR REPLACE INTO email_changes (id, email) VALUES (?, ?)", chunk)
+    updated = conn.execute(APPLY_EMAIL_CHANGES).rowcount
+    conn.execute("DELETE FROM email_changes")
+    return updated
+
+
 #### Update user's email with automatic transaction handling
 update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
+
+#### Many updates sharing one commit per 100 calls (or per 50 ms); the
+#### current emails are written back unchanged, so users.db is left as it was
+conn = sqlite3.connect('users.db')
+current_emails = conn.execute("SELECT id, email FROM users ORDER BY id LIMIT 100").fetchall()
+conn.close()
+
+with GroupCommit('users.db', max_operations=100, max_delay=0.05) as group:
+    for user_id, email in current_emails:
+        update_user_email(user_id=user_id, new_email=email)
+print(group.stats)
+
+#### Rewrite many emails with one set-based UPDATE (same values again)
+updated = update_user_emails(current_emails)
+print(f"Updated {updated} emails")
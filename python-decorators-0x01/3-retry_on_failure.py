@@ -1,42 +1,129 @@
 import time
 import sqlite3
+import asyncio
+import inspect
 import functools
 
+from db_pool import SQLitePool
+from retry_policy import CircuitBreaker, backoff_delay, default_budget
+
+# Shared pool of users.db connections
+users_pool = SQLitePool('users.db', size=5, profile='read-heavy')
+
+# Trips when users.db keeps failing, so callers stop hammering it
+users_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
 # --- Decorator to handle opening and closing the database connection ---
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
-        try:
+        # Borrow a warm pooled connection (statements stay prepared)
+        with users_pool.connection() as conn:
             return func(conn, *args, **kwargs)
-        finally:
-            conn.close()
     return wrapper
 
 
 # --- Decorator to retry function on failure ---
-def retry_on_failure(retries=3, delay=2):
+def retry_on_failure(retries=3, delay=2, max_delay=30, deadline=None,
+                     exceptions=(sqlite3.OperationalError,), budget=None, breaker=None):
+    """
+    Retries transient errors with exponential backoff and full jitter.
+    - delay / max_delay: base and cap of the backoff, in seconds.
+    - deadline: give up once this many seconds have passed in total.
+    - budget: RetryBudget shared with other callers (default_budget if None),
+      so retries stop piling onto a database that keeps failing.
+    - breaker: optional CircuitBreaker; a call counts as one failure once
+      its retries are used up, and while the breaker is open calls fail
+      fast with CircuitOpenError.
+    Works on plain and coroutine functions.
+    """
+    budget = default_budget if budget is None else budget
+
+    def next_delay(attempt, started, error):
+        # Seconds to wait before the next attempt, or None to give up
+        print(f"[Retry {attempt}/{retries}] Transient error: {error}")
+        if attempt >= retries:
+            print("Max retries reached. Operation failed.")
+            return None
+        if breaker is not None and breaker.is_open:
+            print("Circuit open. Operation failed.")
+            return None
+        wait = backoff_delay(attempt, delay, max_delay)
+        if deadline is not None and time.monotonic() - started + wait > deadline:
+            print("Retry deadline reached. Operation failed.")
+            return None
+        if not budget.try_spend():
+            print("Retry budget exhausted. Operation failed.")
+            return None
+        return wait
+
+    def succeeded():
+        budget.record_success()
+        if breaker is not None:
+            breaker.record_success()
+
+    def failed(trial):
+        if breaker is not None:
+            breaker.record_failure(trial)
+
+    def aborted(trial):
+        # Errors that aren't retried say nothing about the database's
+        # health, but must not leave a half-open breaker stuck in its trial
+        if trial:
+            breaker.cancel_trial()
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.monotonic()
+                attempt = 0
+                trial = breaker is not None and breaker.before_call()
+                while True:
+                    try:
+                        result = await func(*args, **kwargs)
+                    except exceptions as e:
+                        attempt += 1
+                        wait = next_delay(attempt, started, e)
+                        if wait is None:
+                            failed(trial)
+                            raise
+                        await asyncio.sleep(wait)
+                    except BaseException:
+                        aborted(trial)
+                        raise
+                    else:
+                        succeeded()
+                        return result
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            started = time.monotonic()
             attempt = 0
-            while attempt < retries:
+            trial = breaker is not None and breaker.before_call()
+            while True:
                 try:
-                    return func(*args, **kwargs)
-                except sqlite3.OperationalError as e:
+                    result = func(*args, **kwargs)
+                except exceptions as e:
                     attempt += 1
-                    print(f"[Retry {attempt}/{retries}] Transient error: {e}")
-                    if attempt < retries:
-                        time.sleep(delay)
-                    else:
-                        print("Max retries reached. Operation failed.")
+                    wait = next_delay(attempt, started, e)
+                    if wait is None:
+                        failed(trial)
                         raise
+                    time.sleep(wait)
+                except BaseException:
+                    aborted(trial)
+                    raise
+                else:
+                    succeeded()
+                    return result
         return wrapper
     return decorator
 
 
 @with_db_connection
-@retry_on_failure(retries=3, delay=1)
+@retry_on_failure(retries=3, delay=1, deadline=10, breaker=users_breaker)
 def fetch_users_with_retry(conn):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM users")
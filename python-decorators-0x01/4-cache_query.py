@@ -1,39 +1,110 @@
 import time
 import sqlite3
 import functools
+import threading
 
-# Global cache dictionary
-query_cache = {}
+from cache_store import STALE, QueryCache, SingleFlight, tables_read
+from db_pool import SQLitePool
+
+# Shared pool of users.db connections
+users_pool = SQLitePool('users.db', size=5, profile='read-heavy')
+
+# Global cache: bounded LRU with per-entry TTL, invalidated by writes.
+# Entries older than refresh_after are served while being refreshed.
+query_cache = QueryCache(max_entries=256, max_bytes=64 * 1024 * 1024, ttl=300,
+                         refresh_after=60)
+
+# Queries currently being executed, so concurrent misses run them once
+in_flight_queries = SingleFlight()
 
 # --- Decorator to handle opening and closing DB connections ---
 def with_db_connection(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
-        try:
+        # Borrow a warm pooled connection (statements stay prepared)
+        with users_pool.connection() as conn:
             return func(conn, *args, **kwargs)
-        finally:
-            conn.close()
     return wrapper
 
 
+# --- Helpers to build cache keys ---
+def database_path(conn):
+    """
+    Returns the file path of the connection's main database, or None for
+    in-memory and temporary databases, which have no path to share.
+    """
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == 'main':
+            return path or None
+    return None
+
+
+def freeze(value):
+    """Turns lists/dicts in bound parameters into hashable tuples."""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    return value
+
+
 # --- Decorator to cache query results ---
-def cache_query(func):
+def cache_query(func=None, *, cache=None, ttl=None):
+    """
+    Caches results keyed by database path, query text and bound parameters.
+    Usable bare (@cache_query) or configured (@cache_query(ttl=60)).
+    Concurrent misses for one key run the query once (single-flight);
+    stale entries are served while a background thread refreshes them.
+    Queries on in-memory databases are not cached: every such connection
+    is a different database, and a refresh couldn't reopen it.
+    """
+    if func is None:
+        return functools.partial(cache_query, cache=cache, ttl=ttl)
+    cache = cache if cache is not None else query_cache
+
+    def load(key, conn, args, kwargs, query):
+        # Read the generation first: a write during the query discards the result
+        generation = cache.generation
+        result = func(conn, *args, **kwargs)
+        cache.set(key, result, tables=tables_read(query), ttl=ttl, generation=generation)
+        return result
+
+    def refresh(key, args, kwargs, query):
+        # Runs on a background thread with its own connection
+        def load_fresh():
+            conn = sqlite3.connect(key[0])
+            try:
+                return load(key, conn, args, kwargs, query)
+            finally:
+                conn.close()
+        try:
+            in_flight_queries.do(key, load_fresh)
+        except Exception as e:
+            print(f"[CACHE REFRESH FAILED] {query}: {e}")
+
     @functools.wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(conn, *args, **kwargs):
         # Get the query from kwargs or positional args
-        query = kwargs.get("query") if "query" in kwargs else args[1] if len(args) > 1 else None
-        
+        query = kwargs.get("query") if "query" in kwargs else args[0] if args else None
+        params = freeze((args[1:] if "query" not in kwargs else args,
+                         {k: v for k, v in kwargs.items() if k != "query"}))
+        path = database_path(conn)
+        if path is None:
+            return func(conn, *args, **kwargs)
+        key = (path, query, params)
+
         # Check cache
-        if query in query_cache:
+        state, result = cache.lookup(key)
+        if state is not None:
+            if state is STALE and not in_flight_queries.in_flight(key):
+                threading.Thread(target=refresh, args=(key, args, kwargs, query),
+                                 daemon=True).start()
             print(f"[CACHE HIT] Returning cached result for query: {query}")
-            return query_cache[query]
-        
-        # Not cached: execute query and store result
+            return result
+
+        # Not cached: execute query (once across threads) and store result
         print(f"[CACHE MISS] Executing and caching result for query: {query}")
-        result = func(*args, **kwargs)
-        query_cache[query] = result
-        return result
+        return in_flight_queries.do(key, lambda: load(key, conn, args, kwargs, query))
     return wrapper
 
 
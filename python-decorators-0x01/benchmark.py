@@ -0,0 +1,88 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from db_pool import SQLitePool
+
+LOOKUP = "SELECT * FROM users WHERE id = ?"
+
+
+# --- Sample database ---
+def create_sample_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+    conn.executemany(
+        "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+        ((f"User {i}", f"user{i}@example.com", 18 + i % 80) for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+# --- Point lookup variants ---
+def connect_per_call(path):
+    # What the original with_db_connection + get_user_by_id do
+    def lookup(user_id):
+        conn = sqlite3.connect(path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(LOOKUP, (user_id,))
+            return cursor.fetchone()
+        finally:
+            conn.close()
+    return lookup
+
+
+def pooled(pool):
+    def lookup(user_id):
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(LOOKUP, (user_id,))
+            return cursor.fetchone()
+    return lookup
+
+
+def measure(lookup, calls, rows):
+    """Returns per-call latencies in microseconds."""
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        lookup(i % rows + 1)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call latency of point lookups.")
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--rows', type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'users.db')
+        create_sample_db(path, args.rows)
+        # cached_statements=0 re-prepares the SELECT on every call
+        unprepared = SQLitePool(path, size=1, cached_statements=0)
+        prepared = SQLitePool(path, size=1)
+
+        variants = [
+            ("connect per call", connect_per_call(path)),
+            ("pooled, no stmt cache", pooled(unprepared)),
+            ("pooled, stmt cache", pooled(prepared)),
+        ]
+        print(f"{'variant':>22} {'mean us':>8} {'p50 us':>7} {'p99 us':>7}")
+        for name, lookup in variants:
+            measure(lookup, min(args.calls, 1000), args.rows)  # warm up
+            latencies = measure(lookup, args.calls, args.rows)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(f"{name:>22} {statistics.mean(latencies):>8.1f} "
+                  f"{statistics.median(latencies):>7.1f} {p99:>7.1f}")
+        unprepared.close()
+        prepared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# Every QueryCache registers here so writes can invalidate all of them
+_caches = weakref.WeakSet()
+
+# Tables a statement reads from / writes to (good enough for the simple
+# single-statement SQL these exercises run)
+READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+["`\[]?(\w+)', re.IGNORECASE)
+WRITE_TABLES = re.compile(
+    r'\b(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+["`\[]?(\w+)',
+    re.IGNORECASE
+)
+
+
+def tables_read(sql):
+    """Returns the lower-cased table names a query reads."""
+    return {table.lower() for table in READ_TABLES.findall(sql or '')}
+
+
+def tables_written(sql):
+    """Returns the lower-cased table names a statement writes."""
+    return {table.lower() for table in WRITE_TABLES.findall(sql or '')}
+
+
+def deep_sizeof(value):
+    """Approximate size in bytes of a query result (rows of scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in value.items())
+    return size
+
+
+# Entry states returned by QueryCache.lookup
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache for query results.
+    - max_entries / max_bytes: least recently used entries are evicted
+      when either limit is exceeded.
+    - ttl: seconds before an entry expires (None = never expires).
+    - refresh_after: seconds after which an entry is still served but
+      reported STALE, so the caller can refresh it in the background
+      (stale-while-revalidate). None disables it.
+    - Entries remember the tables their query reads, so a write to any
+      of those tables drops them (see invalidate_tables).
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=300,
+                 refresh_after=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation, so loads that started before a
+        # write can't store their (now stale) result afterwards
+        self.generation = 0
+        # key -> (value, size, expires_at, refresh_at, tables)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        _caches.add(self)
+
+    def lookup(self, key):
+        """Returns (FRESH or STALE, value) for a cached entry, else (None, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            value, _, expires_at, refresh_at, _ = entry
+            now = time.monotonic()
+            if expires_at is not None and now >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return (STALE if refresh_at is not None and now >= refresh_at else FRESH), value
+
+    def get(self, key):
+        """Returns (True, value) for a cached entry, else (False, None)."""
+        state, value = self.lookup(key)
+        return state is not None, value
+
+    def set(self, key, value, tables=(), ttl=None, generation=None):
+        """
+        Stores a result; `tables` are the tables it was read from.
+        Pass the `generation` read before running the query to skip
+        storing if an invalidation happened in the meantime.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = deep_sizeof(value)
+        if size > self.max_bytes:
+            return  # Too large to cache at all
+        now = time.monotonic()
+        expires_at = None if ttl is None else now + ttl
+        refresh_at = None if self.refresh_after is None else now + self.refresh_after
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at, refresh_at, frozenset(tables))
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tables(self, tables):
+        """Drops every entry that reads one of the given tables."""
+        tables = {table.lower() for table in tables}
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, entry in self._entries.items() if entry[4] & tables]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        size = self._entries.pop(key)[1]
+        self.bytes -= size
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs
+    the function, the others wait and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn):
+        """Runs fn() once per key at a time; returns its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def invalidate_tables(tables):
+    """Drops entries reading any of `tables` from every QueryCache."""
+    return sum(cache.invalidate_tables(tables) for cache in list(_caches))
@@ -0,0 +1,146 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from tuning import DEFAULT_PROFILE, apply_profile, profile_pragmas
+
+
+class PoolStats:
+    """Checkout counters and wait times for a SQLitePool."""
+
+    def __init__(self):
+        self.created = 0
+        self.checkouts = 0
+        self.reused_by_thread = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def average_wait(self):
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+    def __repr__(self):
+        return (f"PoolStats(created={self.created}, checkouts={self.checkouts}, "
+                f"reused_by_thread={self.reused_by_thread}, waits={self.waits}, "
+                f"average_wait={self.average_wait * 1000:.3f}ms, "
+                f"max_wait={self.max_wait * 1000:.3f}ms)")
+
+
+class SQLitePool:
+    """
+    Bounded pool of SQLite connections to one database file.
+    - size: maximum open connections; checkouts wait when all are in use.
+    - profile / pragmas: a tuning profile name (see tuning.PROFILES) or a
+      dict of PRAGMAs, applied once when a connection is opened; the
+      profile wins when both are given (default: DEFAULT_PROFILE).
+    - A thread gets back the connection it used last when it is idle,
+      and nested checkouts in one thread share the same connection.
+    - cached_statements: size of sqlite3's per-connection prepared
+      statement cache, which pooled connections keep warm between checkouts.
+    """
+
+    def __init__(self, database='users.db', size=5, pragmas=None, timeout=None,
+                 cached_statements=256, profile=None):
+        self.database = database
+        self.size = size
+        if profile is None and pragmas is None:
+            profile = DEFAULT_PROFILE
+        self.pragmas = profile_pragmas(pragmas if profile is None else profile)
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.stats = PoolStats()
+        self._idle = []
+        self._available = threading.Condition()
+        self._opened = 0
+        self._local = threading.local()
+
+    def _open(self):
+        # Connections move between threads, but only one uses each at a time
+        conn = sqlite3.connect(self.database, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        apply_profile(conn, self.pragmas)
+        with self._available:
+            self.stats.created += 1
+        return conn
+
+    def acquire(self):
+        """Checks out a connection; raises queue.Empty on timeout."""
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            return local.conn
+
+        start = time.perf_counter()
+        waited = False
+        with self._available:
+            while True:
+                preferred = getattr(local, 'last', None)
+                if preferred is not None and preferred in self._idle:
+                    self._idle.remove(preferred)
+                    conn = preferred
+                    self.stats.reused_by_thread += 1
+                    break
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    conn = None
+                    break
+                waited = True
+                remaining = None if self.timeout is None else self.timeout - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty("no SQLite connection available")
+                self._available.wait(remaining)
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except sqlite3.Error:
+                with self._available:
+                    self._opened -= 1
+                    self._available.notify()
+                raise
+
+        wait = time.perf_counter() - start
+        with self._available:
+            stats = self.stats
+            stats.checkouts += 1
+            stats.waits += waited
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+        local.conn = local.last = conn
+        local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """Returns a connection, rolling back anything left uncommitted."""
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+        local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self._available:
+            self._idle.append(conn)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Closes all idle connections."""
+        with self._available:
+            for conn in self._idle:
+                conn.close()
+                self._opened -= 1
+            self._idle.clear()
@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import time
+
+from cache_store import invalidate_tables, tables_written
+from tuning import apply_profile
+
+_local = threading.local()
+
+
+def current_group():
+    """Returns the GroupCommit scope active in this thread, if any."""
+    return getattr(_local, 'group', None)
+
+
+class CommitStats:
+    """Commit counters and latencies for a GroupCommit."""
+
+    def __init__(self):
+        self.commits = 0
+        self.operations = 0
+        self.rolled_back = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def average_latency(self):
+        return self.total_latency / self.commits if self.commits else 0.0
+
+    @property
+    def average_batch(self):
+        return self.operations / self.commits if self.commits else 0.0
+
+    def __repr__(self):
+        return (f"CommitStats(commits={self.commits}, operations={self.operations}, "
+                f"rolled_back={self.rolled_back}, average_batch={self.average_batch:.1f}, "
+                f"average_latency={self.average_latency * 1000:.3f}ms, "
+                f"max_latency={self.max_latency * 1000:.3f}ms)")
+
+
+class GroupCommit:
+    """
+    Scope in which transactional calls share one SQLite transaction.
+    - Each call runs inside its own savepoint, so a failing call rolls
+      back only its own changes.
+    - The transaction is committed every `max_operations` calls, and a
+      background thread commits whatever is pending every `max_delay`
+      seconds. Calls that returned are durable only after that commit.
+    - profile: tuning profile from tuning.PROFILES for the connection.
+    - Anything still pending is committed when the scope exits.
+
+        with GroupCommit('users.db') as group:
+            for user_id, email in changes:
+                update_user_email(user_id=user_id, new_email=email)
+        print(group.stats)
+    """
+
+    def __init__(self, database='users.db', max_operations=100, max_delay=0.05,
+                 profile='write-heavy'):
+        self.database = database
+        self.max_operations = max_operations
+        self.max_delay = max_delay
+        self.stats = CommitStats()
+        # The committer thread commits on this connection too; the lock
+        # keeps it from committing in the middle of a call
+        self.conn = apply_profile(sqlite3.connect(database, check_same_thread=False), profile)
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._written = set()
+        self._savepoints = 0
+        self._frames = []   # tables written by each running call, innermost last
+        self._stop = threading.Event()
+        self._committer = threading.Thread(target=self._commit_periodically,
+                                           name='group-commit', daemon=True)
+        self._committer.start()
+
+    def run(self, func, *args, **kwargs):
+        """Runs func(conn, ...) in a savepoint of the shared transaction."""
+        conn = self.conn
+        with self._lock:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            self._savepoints += 1
+            savepoint = f"op_{self._savepoints}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+            # Nested calls push their own frame; one trace callback
+            # records writes into the innermost one
+            outermost = not self._frames
+            self._frames.append(set())
+            if outermost:
+                conn.set_trace_callback(self._trace)
+            try:
+                result = func(conn, *args, **kwargs)
+            except Exception:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+                self.stats.rolled_back += 1
+                self._frames.pop()
+                raise
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+                written = self._frames.pop()
+            finally:
+                if outermost:
+                    conn.set_trace_callback(None)
+            if not outermost:
+                # Committed with (or rolled back by) the enclosing call
+                self._frames[-1] |= written
+                return result
+            self._written |= written
+            self._pending += 1
+            if self._pending >= self.max_operations:
+                self.flush()
+            return result
+
+    def _trace(self, sql):
+        self._frames[-1].update(tables_written(sql))
+
+    def flush(self):
+        """Commits the pending calls; returns how many were committed."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            start = time.perf_counter()
+            self.conn.commit()
+            latency = time.perf_counter() - start
+            committed, written = self._pending, self._written
+            self._pending, self._written = 0, set()
+            stats = self.stats
+            stats.commits += 1
+            stats.operations += committed
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+        # Cached reads of those tables are now stale
+        if written:
+            invalidate_tables(written)
+        return committed
+
+    def _commit_periodically(self):
+        while not self._stop.wait(self.max_delay):
+            self.flush()
+
+    def close(self):
+        """Stops the committer, commits what is pending and closes the connection."""
+        self._stop.set()
+        self._committer.join()
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+    def __enter__(self):
+        self._outer = current_group()
+        _local.group = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.group = self._outer
+        self.close()
@@ -0,0 +1,109 @@
+import atexit
+import logging
+import math
+import queue
+import random
+import threading
+from collections import Counter, namedtuple
+
+# One measured query call, handed to a sink
+QueryRecord = namedtuple('QueryRecord', 'query duration rows outcome error started_at')
+
+
+class QueuedLogSink:
+    """
+    Logs query records from a background thread, so callers only pay
+    for a queue put. Records are sampled at `sample_rate`, but slow
+    queries (duration >= slow_threshold seconds) and errors are always
+    logged, at WARNING level.
+    """
+
+    def __init__(self, logger=None, sample_rate=1.0, slow_threshold=None):
+        self.logger = logger or logging.getLogger('sql')
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.dropped = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name='query-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, record):
+        slow = self.slow_threshold is not None and record.duration >= self.slow_threshold
+        if slow or record.outcome != 'ok' or random.random() < self.sample_rate:
+            self._queue.put((record, slow))
+        else:
+            self.dropped += 1
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            record, slow = item
+            level = logging.WARNING if slow or record.outcome != 'ok' else logging.INFO
+            self.logger.log(
+                level, "%s%s in %.3f ms, rows=%s: %s%s",
+                "SLOW " if slow else "", record.outcome, record.duration * 1000,
+                record.rows, record.query, f" ({record.error})" if record.error else ""
+            )
+
+    def close(self):
+        """Flushes queued records and stops the logging thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class HistogramSink:
+    """
+    In-memory latency histogram with power-of-two microsecond buckets,
+    plus counts per outcome. Cheap enough to record every call.
+    """
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.outcomes = Counter()
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        bucket = max(0, math.ceil(math.log2(max(record.duration * 1_000_000, 1))))
+        with self._lock:
+            self.buckets[bucket] += 1
+            self.outcomes[record.outcome] += 1
+            self.count += 1
+            self.total += record.duration
+
+    def percentile(self, p):
+        """Upper bound, in seconds, of the bucket holding the p-th percentile."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(p / 100 * self.count))
+            seen = 0
+            for bucket in sorted(self.buckets):
+                seen += self.buckets[bucket]
+                if seen >= rank:
+                    return 2 ** bucket / 1_000_000
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else None,
+            'p50_ms': (self.percentile(50) or 0) * 1000,
+            'p99_ms': (self.percentile(99) or 0) * 1000,
+            'outcomes': dict(self.outcomes),
+        }
+
+
+class FanoutSink:
+    """Sends every record to several sinks."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def record(self, record):
+        for sink in self.sinks:
+            sink.record(record)
@@ -0,0 +1,100 @@
+import random
+import threading
+import time
+
+
+def backoff_delay(attempt, base, max_delay):
+    """Full jitter: a random sleep between 0 and base * 2**(attempt - 1), capped."""
+    return random.uniform(0, min(max_delay, base * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """
+    Token bucket shared by retrying callers. Every retry spends one
+    token and every successful call earns back `ratio` tokens, so over
+    time retries stay under `ratio` of successful traffic. When the
+    bucket is empty, failures are raised instead of retried.
+    """
+
+    def __init__(self, max_tokens=10, ratio=0.1):
+        self.max_tokens = max_tokens
+        self.ratio = ratio
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_success(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self):
+        """Takes a token for one retry; returns False when the budget is spent."""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling through while a circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects
+    calls for `reset_timeout` seconds. After that one trial call is let
+    through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError unless a call may go through. Returns True
+        when the caller was let through as the half-open trial; it must
+        then pass trial=True to record_failure() or cancel_trial().
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if self._trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError("circuit open: too many recent failures")
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def cancel_trial(self):
+        """
+        Ends the trial call (only its holder may call this) after it failed
+        for an unrelated reason, so the next call can be the trial instead.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self, trial=False):
+        """Records one failed call; a failed trial reopens the circuit."""
+        with self._lock:
+            self.failures += 1
+            if trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            if trial:
+                self._trial = False
+
+
+# Shared by every retry_on_failure that doesn't pass its own budget
+default_budget = RetryBudget()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for retry_policy.py and the retry_on_failure decorator.
+
+Covers:
+- CircuitBreaker opening, half-open trial and closing again
+- a half-open trial failing with an error that isn't retried
+- one breaker failure per call, however many attempts it made
+- only the trial holder can end the trial
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from retry_policy import CircuitBreaker, CircuitOpenError, RetryBudget
+
+
+def load_retry_module():
+    """Imports 3-retry_on_failure.py, whose demo needs a users table in cwd."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            conn = sqlite3.connect('users.db')
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.close()
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = __import__('3-retry_on_failure')
+            module.users_pool.close()
+            return module
+        finally:
+            os.chdir(cwd)
+
+
+retry = load_retry_module()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test CircuitBreaker state changes."""
+
+    def test_opens_and_closes_after_trial(self) -> None:
+        """The breaker opens at the threshold and a good trial closes it."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.01)
+        breaker.record_failure()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        time.sleep(0.02)
+        self.assertTrue(breaker.before_call())
+        breaker.record_success()
+        self.assertFalse(breaker.is_open)
+        self.assertFalse(breaker.before_call())
+
+    def test_only_trial_holder_ends_trial(self) -> None:
+        """A failure from a caller admitted before the trial keeps it running."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.before_call())
+        breaker.record_failure(trial=False)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+
+class TestRetryOnFailureCounting(unittest.TestCase):
+    """Test how retried calls are counted by the breaker."""
+
+    def test_failures_counted_per_call(self) -> None:
+        """Two calls of three attempts each are two failures, not six."""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
+        @retry.retry_on_failure(retries=3, delay=0, budget=RetryBudget(),
+                                breaker=breaker)
+        def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(2):
+                with self.assertRaises(sqlite3.OperationalError):
+                    locked()
+        self.assertEqual(breaker.failures, 2)
+        self.assertFalse(breaker.is_open)
+
+
+class TestRetryOnFailureHalfOpen(unittest.TestCase):
+    """Test retry_on_failure with a half-open breaker."""
+
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+
+        @retry.retry_on_failure(retries=1, delay=0, budget=RetryBudget(),
+                                breaker=self.breaker)
+        def query(kind):
+            if kind == 'locked':
+                raise sqlite3.OperationalError("database is locked")
+            if kind == 'bad':
+                raise ValueError("bad input")
+            return kind
+
+        self.query = query
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(sqlite3.OperationalError):
+                query('locked')
+        self.assertTrue(self.breaker.is_open)
+        time.sleep(0.02)
+
+    def test_unrelated_error_in_trial_does_not_wedge_breaker(self) -> None:
+        """A trial raising a non-retried error lets the next call through."""
+        with self.assertRaises(ValueError):
+            self.query('bad')
+        self.assertEqual(self.query('good'), 'good')
+        self.assertFalse(self.breaker.is_open)
+
+    def test_transient_error_in_trial_reopens_breaker(self) -> None:
+        """A trial failing with a retried error reopens the breaker."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.query('locked')
+        with self.assertRaises(CircuitOpenError):
+            self.query('good')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the transactional decorator in 2-transactional.py.
+
+Covers:
+- nested transactional calls on one connection still invalidate every
+  table the outer call writes
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_store import QueryCache
+
+
+def load_transactional_module():
+    """Imports 2-transactional.py, whose demo needs a users table in cwd."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            conn = sqlite3.connect('users.db')
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+            conn.execute("INSERT INTO users (email) VALUES ('a@example.com')")
+            conn.commit()
+            conn.close()
+            with contextlib.redirect_stdout(io.StringIO()):
+                return __import__('2-transactional')
+        finally:
+            os.chdir(cwd)
+
+
+transactional_module = load_transactional_module()
+transactional = transactional_module.transactional
+
+
+class TestNestedTransactional(unittest.TestCase):
+    """Test write tracking across nested transactional calls."""
+
+    def setUp(self) -> None:
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        self.conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)")
+        self.conn.execute("INSERT INTO users (email) VALUES ('a@example.com')")
+        self.conn.commit()
+        self.cache = QueryCache()
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def test_outer_writes_after_inner_call_invalidate(self) -> None:
+        """Writes made after a nested call still drop cached reads."""
+        @transactional
+        def inner(conn):
+            conn.execute("UPDATE users SET email = 'b@example.com' WHERE id = 1")
+
+        @transactional
+        def outer(conn):
+            inner(conn)
+            conn.execute("INSERT INTO orders (user_id) VALUES (1)")
+
+        self.cache.set('orders', [], tables={'orders'})
+        self.cache.set('users', [], tables={'users'})
+        outer(self.conn)
+        self.assertEqual(self.cache.get('orders'), (False, None))
+        self.assertEqual(self.cache.get('users'), (False, None))
+
+    def test_trace_callback_removed_after_outer_call(self) -> None:
+        """Writes after the outermost call returns are no longer tracked."""
+        @transactional
+        def outer(conn):
+            conn.execute("INSERT INTO orders (user_id) VALUES (1)")
+
+        outer(self.conn)
+        self.assertNotIn(id(self.conn), transactional_module._write_frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# Named SQLite tuning profiles, run once when a connection is opened.
+# busy_timeout comes first so the journal_mode switch can wait for a lock.
+# The context-manager exercises (python-context-async-perations-0x02)
+# import this module through a symlink, so there is one copy.
+PROFILES = {
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,          # negative = KiB, so 16 MB of page cache
+    },
+    'read-heavy': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',         # readers don't block on the writer
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,          # 64 MB page cache
+        'mmap_size': 268435456,        # read pages straight from a 256 MB mapping
+        'temp_store': 'MEMORY',
+    },
+    'write-heavy': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',       # fsync at checkpoints, not every commit
+        'cache_size': -32000,
+        'mmap_size': 67108864,
+        'temp_store': 'MEMORY',
+    },
+    'bulk-load': {
+        'busy_timeout': 30000,
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',          # no fsync: rerun the load after a crash
+        'cache_size': -262144,         # 256 MB page cache
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+}
+
+# Used by SQLitePool when no profile or PRAGMAs are given
+DEFAULT_PROFILE = 'balanced'
+
+
+def profile_pragmas(profile):
+    """Returns the PRAGMAs for a profile name (or a dict of PRAGMAs as is)."""
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile!r}")
+        return PROFILES[profile]
+    return profile or {}
+
+
+def apply_profile(conn, profile):
+    """Runs a profile's PRAGMAs on an open connection; returns the connection."""
+    for name, value in profile_pragmas(profile).items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def busy_timeout(profile, default=5.0):
+    """
+    A profile's busy_timeout in seconds, for sqlite3.connect(timeout=...).
+    Short-lived connections should use only this: the other PRAGMAs pay
+    off on pooled or long-lived connections, and WAL mode, once set by
+    those, persists in the database file.
+    """
+    milliseconds = profile_pragmas(profile).get('busy_timeout')
+    return default if milliseconds is None else milliseconds / 1000
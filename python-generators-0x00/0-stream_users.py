@@ -1,40 +1,31 @@
-import mysql.connector
-from mysql.connector import Error
+from backends import get_backend
+from columnar import row_type
 
-def stream_users():
+
+def stream_users(fetch_size=1000, row_format='dict', backend=None):
     """
     Generator function that streams rows from the user_data table one by one.
-    Yields each row as a dictionary.
+    Yields each row as a dictionary, or as a compact namedtuple when
+    row_format='tuple'.
+    Rows are fetched `fetch_size` at a time (an unbuffered cursor on MySQL),
+    so at most one fetch is held in client memory.
+    `backend` picks the store: 'mysql', 'sqlite', 'parquet' or an instance.
     """
+    if row_format not in ('dict', 'tuple'):
+        raise ValueError(f"Unknown row format: {row_format!r}")
+    backend = get_backend(backend)
     try:
-        # Connect to the MySQL database
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',              # Change if needed
-            password='your_password', # Replace with your MySQL password
-            database='ALX_prodev'
-        )
-
-        if connection.is_connected():
-            cursor = connection.cursor(dictionary=True)
-
-            # Execute query to select all user data
-            cursor.execute("SELECT * FROM user_data;")
-
-            # ✅ One single loop using yield
-            for row in cursor:
-                yield row  # Stream each record one by one
-
-    except Error as e:
+        # ✅ One single loop using yield
+        for names, rows in backend.scan(batch_size=fetch_size):
+            if row_format == 'tuple':
+                yield from map(row_type(names)._make, rows)
+            else:
+                for row in rows:
+                    yield dict(zip(names, row))  # Stream each record one by one
+
+    except backend.Error as e:
         print(f"❌ Database error: {e}")
 
-    finally:
-        # Close cursor and connection when done
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-            print("✅ Connection closed.")
-
 
 # ==========================
 # Example usage (for testing)
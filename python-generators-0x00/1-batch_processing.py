@@ -1,53 +1,119 @@
-import mysql.connector
 from mysql.connector import Error
 
+import db
+from backends import get_backend
+from columnar import ROW_FORMATS, format_batch, row_type
 
-def stream_users_in_batches(batch_size=10):
+
+def stream_users_in_batches(batch_size=10, columns=None, filters=None, row_format='dict',
+                            backend=None):
     """
-    Generator that streams user_data rows from MySQL in batches.
+    Generator that streams user_data rows in batches.
     Each yield returns a list of dictionaries (one batch).
+    Rows are fetched `batch_size` at a time (an unbuffered cursor on MySQL),
+    so only one batch lives in client memory.
+
+    - columns: optional projection, e.g. ('name', 'age').
+    - filters: optional list of (column, operator, value) tuples pushed
+      down to the store, or callables applied in Python as a fallback
+      (the columns they read must be part of the projection).
+    - row_format: 'dict' (default), 'tuple' for lists of namedtuples, or
+      'columnar' for a columnar.ColumnBatch per batch. Python fallback
+      filters see namedtuple rows unless the format is 'dict'.
+    - backend: 'mysql', 'sqlite', 'parquet' or a backends instance;
+      defaults to ALX_BACKEND (MySQL when unset).
     """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row format: {row_format!r}")
+    backend = get_backend(backend)
+    fallbacks = [item for item in filters or () if callable(item)]
+    pushed = [item for item in filters or () if not callable(item)]
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',              # Change as needed
-            password='your_password', # Replace with your MySQL password
-            database='ALX_prodev'
-        )
-
-        if connection.is_connected():
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM user_data;")
-
-            batch = []
-            for row in cursor:  # ✅ Loop #1
-                batch.append(row)
-                if len(batch) == batch_size:
+        for names, batch in backend.scan(columns, pushed, batch_size):  # ✅ Loop #1
+            if fallbacks:
+                if row_format == 'dict':
+                    batch = [dict(zip(names, row)) for row in batch]
+                else:
+                    batch = list(map(row_type(names)._make, batch))
+                for check in fallbacks:
+                    batch = [row for row in batch if check(row)]
+                if not batch:
+                    continue
+                if row_format != 'columnar':
                     yield batch
-                    batch = []
+                    continue
+            yield format_batch(names, batch, row_format)
+
+    except backend.Error as e:
+        print(f"❌ Database error: {e}")
+
+
+def stream_users_by_key(batch_size=10, after=None, until=None):
+    """
+    Generator that pages through user_data with keyset (seek) pagination.
+    Each batch is a short `user_id > last_seen ORDER BY user_id LIMIT n`
+    query, so no long-running statement stays open between batches.
 
-            # Yield any remaining rows
-            if batch:
-                yield batch
+    - after: resume token; only rows with user_id > after are returned.
+      The token for a batch is its last row's user_id.
+    - until: optional inclusive upper bound, for disjoint worker ranges.
+    """
+    last_seen = after
+    try:
+        while True:
+            conditions = []
+            params = []
+            if last_seen is not None:
+                conditions.append("user_id > %s")
+                params.append(last_seen)
+            if until is not None:
+                conditions.append("user_id <= %s")
+                params.append(until)
+            where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+            # Borrow a pooled connection per page; none is held between batches
+            with db.connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                cursor.execute(
+                    f"SELECT * FROM user_data {where}ORDER BY user_id LIMIT %s;",
+                    (*params, batch_size)
+                )
+                batch = cursor.fetchall()
+                cursor.close()
+
+            if not batch:
+                break
+            last_seen = batch[-1]['user_id']
+            yield batch
+            if len(batch) < batch_size:
+                break
 
     except Error as e:
         print(f"❌ Database error: {e}")
 
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-            print("✅ Connection closed.")
+
+def key_ranges(workers):
+    """
+    Splits the UUID user_id key space into `workers` disjoint ranges.
+    Returns (after, until) pairs to pass to stream_users_by_key, so
+    each worker can stream its own slice of the table in parallel.
+    """
+    space = 16 ** 4
+    bounds = [f"{space * i // workers:04x}" for i in range(1, workers)]
+    lowers = [None] + bounds
+    uppers = bounds + [None]
+    return list(zip(lowers, uppers))
 
 
-def batch_processing(batch_size=10):
+def batch_processing(batch_size=10, columns=None, row_format='dict', backend=None):
     """
     Generator that processes each batch from stream_users_in_batches().
-    Filters users over age 25.
+    Filters users over age 25. The filter runs in the store (served by the
+    idx_age index on SQL backends) so only matching rows are fetched.
     """
-    for batch in stream_users_in_batches(batch_size):  # ✅ Loop #2
-        filtered = [user for user in batch if user['age'] > 25]  # ✅ Loop #3 (list comprehension)
-        yield filtered
+    over_25 = [('age', '>', 25)]
+    for batch in stream_users_in_batches(batch_size, columns, over_25, row_format, backend):  # ✅ Loop #2
+        yield batch
 
 
 # ===============================
@@ -1,53 +1,41 @@
-import mysql.connector
-from mysql.connector import Error
+from backends import get_backend
 
 
-def stream_user_ages():
+def stream_user_ages(fetch_size=1000, backend=None):
     """
     Generator that streams user ages one by one from the user_data table.
+    Only the age column is read, `fetch_size` ages per round trip.
+    `backend` picks the store: 'mysql', 'sqlite', 'parquet' or an instance.
     """
+    backend = get_backend(backend)
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',               # Change if needed
-            password='your_password',  # Replace with your MySQL password
-            database='ALX_prodev'
-        )
-
-        if connection.is_connected():
-            cursor = connection.cursor()
-            cursor.execute("SELECT age FROM user_data;")
-
-            # ✅ Loop #1 — yields ages one by one (memory-efficient)
-            for (age,) in cursor:
+        # ✅ Loop #1 — yields ages one by one (memory-efficient)
+        for _, rows in backend.scan(columns=('age',), batch_size=fetch_size):
+            for (age,) in rows:
                 yield int(age)
 
-    except Error as e:
+    except backend.Error as e:
         print(f"❌ Database error: {e}")
 
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-            print("✅ Connection closed.")
 
-
-def calculate_average_age():
+def calculate_average_age(fetch_size=1000, backend=None):
     """
     Uses the stream_user_ages generator to compute the average age
     without loading the entire dataset into memory.
+    Returns the average as well as printing it.
     """
     total_age = 0
     count = 0
 
     # ✅ Loop #2 — consumes the generator, aggregates age and count
-    for age in stream_user_ages():
+    for age in stream_user_ages(fetch_size, backend):
         total_age += age
         count += 1
 
     # Avoid division by zero
     average_age = total_age / count if count > 0 else 0
     print(f"Average age of users: {average_age:.2f}")
+    return average_age
 
 
 # ===============================
@@ -0,0 +1,241 @@
+#!/usr/bin/python3
+"""
+Age aggregations over user_data: average, min, max, count and percentiles.
+
+Three ways to get them:
+- database_age_stats(): pushes AVG/MIN/MAX/COUNT to MySQL and reads an
+  age histogram (GROUP BY age) for exact percentiles.
+- stream_age_stats(): one pass over stream_user_ages() with AgeStats.
+- incremental_age_stats(): updates saved AgeStats with only the rows
+  inserted since the previous run (tracked by a created_at watermark).
+"""
+import json
+import math
+import os
+from collections import Counter
+
+from mysql.connector import Error
+
+import db
+
+stream_user_ages = __import__('4-stream_ages').stream_user_ages
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+# ===============================================
+# Streaming accumulator
+# ===============================================
+
+class AgeStats:
+    """
+    One-pass accumulator for ages.
+    Mean and variance use Welford's algorithm (numerically stable).
+    Ages are DECIMAL(3,0), so an exact histogram of at most 1000 buckets
+    gives exact percentiles in constant memory; no sketch is needed.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = Counter()
+
+    def add(self, age):
+        """Adds one age to the running statistics."""
+        self.count += 1
+        delta = age - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (age - self.mean)
+        self.min = age if self.min is None else min(self.min, age)
+        self.max = age if self.max is None else max(self.max, age)
+        self.histogram[age] += 1
+
+    def update(self, ages):
+        """Adds every age from an iterable."""
+        for age in ages:
+            self.add(age)
+        return self
+
+    @property
+    def variance(self):
+        """Population variance of the ages seen so far."""
+        return self.m2 / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Returns the nearest-rank p-th percentile (0-100)."""
+        return histogram_percentile(self.histogram, self.count, p)
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES):
+        """Returns the statistics as a plain dictionary."""
+        return {
+            'count': self.count,
+            'average': self.mean if self.count else 0,
+            'min': self.min,
+            'max': self.max,
+            'stddev': math.sqrt(self.variance),
+            'percentiles': {p: self.percentile(p) for p in percentiles},
+        }
+
+    def to_dict(self):
+        """Serialisable state, for saving between incremental runs."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min,
+            'max': self.max,
+            'histogram': {str(age): n for age, n in self.histogram.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuilds an accumulator saved with to_dict()."""
+        stats = cls()
+        stats.count = state['count']
+        stats.mean = state['mean']
+        stats.m2 = state['m2']
+        stats.min = state['min']
+        stats.max = state['max']
+        stats.histogram = Counter({int(age): n for age, n in state['histogram'].items()})
+        return stats
+
+
+def histogram_percentile(histogram, count, p):
+    """
+    Nearest-rank percentile from an {age: count} histogram.
+    """
+    if not count:
+        return None
+    rank = max(1, math.ceil(p / 100 * count))
+    seen = 0
+    for age in sorted(histogram):
+        seen += histogram[age]
+        if seen >= rank:
+            return age
+    return max(histogram)
+
+
+# ===============================================
+# Database-side aggregation
+# ===============================================
+
+def database_age_stats(percentiles=DEFAULT_PERCENTILES):
+    """
+    Computes the statistics inside MySQL; only one summary row and
+    a small age histogram cross the wire.
+    """
+    try:
+        with db.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT COUNT(*), AVG(age), MIN(age), MAX(age), STDDEV_POP(age)
+                FROM user_data;
+            """)
+            count, average, youngest, oldest, stddev = cursor.fetchone()
+
+            # Served from idx_age; at most one row per distinct age
+            cursor.execute("SELECT age, COUNT(*) FROM user_data GROUP BY age;")
+            histogram = Counter({int(age): n for age, n in cursor.fetchall()})
+            cursor.close()
+
+        return {
+            'count': count,
+            'average': float(average or 0),
+            'min': None if youngest is None else int(youngest),
+            'max': None if oldest is None else int(oldest),
+            'stddev': float(stddev or 0),
+            'percentiles': {
+                p: histogram_percentile(histogram, count, p) for p in percentiles
+            },
+        }
+    except Error as e:
+        print(f"❌ Database error: {e}")
+        return None
+
+
+def stream_age_stats(percentiles=DEFAULT_PERCENTILES):
+    """
+    Computes the statistics in Python with a single pass over
+    stream_user_ages(), in constant memory.
+    """
+    return AgeStats().update(stream_user_ages()).summary(percentiles)
+
+
+# ===============================================
+# Incremental aggregation
+# ===============================================
+
+def stream_new_ages(after=None, fetch_size=1000, settle=300):
+    """
+    Yields (created_at, user_id, age) for rows inserted after the
+    (created_at, user_id) watermark, oldest first.
+    Rows younger than `settle` seconds are left for the next run; see
+    incremental_age_stats() for why.
+    """
+    conditions = ["created_at <= NOW(6) - INTERVAL %s MICROSECOND"]
+    params = [int(settle * 1_000_000)]
+    if after is not None:
+        conditions.append("(created_at, user_id) > (%s, %s)")
+        params.extend(after)
+    try:
+        with db.connection() as connection:
+            cursor = connection.cursor(buffered=False)
+            try:
+                cursor.execute(
+                    "SELECT created_at, user_id, age FROM user_data "
+                    f"WHERE {' AND '.join(conditions)} "
+                    "ORDER BY created_at, user_id;",
+                    tuple(params)
+                )
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+    except Error as e:
+        print(f"❌ Database error: {e}")
+
+
+def incremental_age_stats(state_path='age_stats.json', percentiles=DEFAULT_PERCENTILES,
+                          settle=300):
+    """
+    Loads the statistics saved by the previous run, folds in only the
+    rows inserted since its watermark, then saves the new state.
+    The first run (no state file) scans the whole table once.
+
+    created_at is stamped when a row is inserted, not when its transaction
+    commits, so a long transaction can commit rows older than a watermark
+    that was already saved; those rows would never be counted. Only rows
+    at least `settle` seconds old are read, which closes that gap as long
+    as no write transaction stays open longer than `settle` (seed.py's
+    bulk loaders commit every few chunks, well within the default).
+    """
+    stats = AgeStats()
+    watermark = None
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as file:
+            saved = json.load(file)
+        stats = AgeStats.from_dict(saved['stats'])
+        watermark = saved['watermark']
+
+    for created_at, user_id, age in stream_new_ages(watermark, settle=settle):
+        stats.add(int(age))
+        watermark = [created_at.isoformat(sep=' '), user_id]
+
+    with open(state_path, 'w', encoding='utf-8') as file:
+        json.dump({'stats': stats.to_dict(), 'watermark': watermark}, file)
+
+    return stats.summary(percentiles)
+
+
+# ===============================
+# Example usage
+# ===============================
+if __name__ == "__main__":
+    print("Database-side:", database_age_stats())
+    print("Incremental:  ", incremental_age_stats())
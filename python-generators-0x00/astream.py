@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Async generator counterparts of the user_data generators.
+
+Each blocking generator runs on its own worker thread, one batch ahead:
+the next batch is fetched while the consumer handles the current one. Rows are handed over per batch, so there is one thread hop
+per batch rather than per row.
+
+    async for user in astream_users():
+        ...
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+stream_users_in_batches = __import__('1-batch_processing').stream_users_in_batches
+batch_processing = __import__('1-batch_processing').batch_processing
+
+_DONE = object()
+
+
+async def aiter_prefetch(generator):
+    """
+    Drives a blocking generator from asyncio, prefetching one item.
+    The generator runs on its own single worker thread, so it is always
+    closed after the thread has left it, even if the consumer stops early
+    or is cancelled mid-fetch.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='aiter-prefetch')
+    try:
+        fetching = asyncio.wrap_future(executor.submit(next, generator, _DONE))
+        while True:
+            item = await fetching
+            if item is _DONE:
+                return
+            fetching = asyncio.wrap_future(executor.submit(next, generator, _DONE))
+            yield item
+    finally:
+        # Queued behind any next() still running on the worker thread;
+        # it completes even if this task is cancelled again while waiting
+        closing = executor.submit(generator.close)
+        executor.shutdown(wait=False)
+        await asyncio.shield(asyncio.wrap_future(closing))
+
+
+async def astream_users_in_batches(batch_size=10, columns=None, filters=None, row_format='dict',
+                                   backend=None):
+    """
+    Async version of stream_users_in_batches(); same arguments and batches.
+    """
+    batches = stream_users_in_batches(batch_size, columns, filters, row_format, backend)
+    async for batch in aiter_prefetch(batches):
+        yield batch
+
+
+async def astream_users(fetch_size=1000, row_format='dict', backend=None):
+    """
+    Async version of stream_users(): yields users one by one,
+    fetching `fetch_size` rows per thread hop.
+    """
+    if row_format not in ('dict', 'tuple'):
+        raise ValueError(f"Unknown row format: {row_format!r}")
+    async for batch in astream_users_in_batches(fetch_size, row_format=row_format, backend=backend):
+        for user in batch:
+            yield user
+
+
+async def abatch_processing(batch_size=10, columns=None, row_format='dict', backend=None):
+    """
+    Async version of batch_processing(): batches of users over age 25.
+    """
+    batches = batch_processing(batch_size, columns, row_format, backend)
+    async for batch in aiter_prefetch(batches):
+        yield batch
+
+
+# ===============================
+# Example usage
+# ===============================
+async def main():
+    async for user in astream_users():
+        print(user)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
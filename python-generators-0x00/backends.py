@@ -0,0 +1,284 @@
+#!/usr/bin/python3
+"""
+Storage backends the user_data generators can stream from.
+
+- MySQLBackend: the ALX_prodev database, through the shared pool in db.py.
+- SQLiteBackend: a local SQLite file in WAL mode, read with fetchmany.
+- ParquetBackend: a Parquet file read through Arrow (requires pyarrow),
+  for offline analytics.
+
+Every backend exposes scan(columns, filters, batch_size), which yields
+(column_names, rows) pairs, rows being lists of tuples. Filters are
+(column, operator, value) tuples and are always applied by the store.
+
+The default backend comes from the ALX_BACKEND environment variable
+(mysql, sqlite or parquet; mysql when unset).
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from mysql.connector import Error
+
+import db
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for ParquetBackend
+    pyarrow = None
+
+# Columns and operators that can be compiled into a store-side filter
+USER_COLUMNS = ('user_id', 'name', 'email', 'age', 'created_at', 'updated_at')
+SQL_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'LIKE', 'IN')
+
+
+def compile_filters(filters, placeholder='%s'):
+    """
+    Splits filters into a SQL WHERE clause and Python fallbacks.
+    A filter is either a (column, operator, value) tuple, which is pushed
+    down to SQL when the column and operator are known, or a callable
+    taking a row, which is applied in Python after fetching.
+    Returns (where_clause, params, fallbacks).
+    """
+    conditions = []
+    params = []
+    fallbacks = []
+    for item in filters or ():
+        if callable(item):
+            fallbacks.append(item)
+            continue
+        column, operator = check_filter(item)
+        value = item[2]
+        if operator == 'IN':
+            values = list(value)
+            if not values:
+                conditions.append("1 = 0")
+                continue
+            placeholders = ', '.join([placeholder] * len(values))
+            conditions.append(f"{column} IN ({placeholders})")
+            params.extend(values)
+        else:
+            conditions.append(f"{column} {operator} {placeholder}")
+            params.append(value)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params, fallbacks
+
+
+def check_filter(item):
+    """
+    Validates a (column, operator, value) filter; returns (column, OPERATOR).
+    """
+    column, operator, _ = item
+    operator = operator.upper()
+    if column not in USER_COLUMNS or operator not in SQL_OPERATORS:
+        raise ValueError(f"Unsupported filter: {item!r}")
+    return column, operator
+
+
+def compile_columns(columns):
+    """
+    Returns the SELECT list for the requested columns (all when None).
+    """
+    if not columns:
+        return "*"
+    unknown = [column for column in columns if column not in USER_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    return ', '.join(columns)
+
+
+# ===============================================
+# SQL backends
+# ===============================================
+
+class SQLBackend:
+    """
+    Streams user_data through a DB-API connection with fetchmany.
+    Subclasses provide connection() and the driver's placeholder/Error.
+    """
+    name = None
+    placeholder = '%s'
+    Error = Exception
+
+    def connection(self):
+        raise NotImplementedError
+
+    def cursor(self, connection):
+        return connection.cursor()
+
+    def scan(self, columns=None, filters=None, batch_size=1000):
+        select = compile_columns(columns)
+        where, params, fallbacks = compile_filters(filters, self.placeholder)
+        if fallbacks:
+            raise ValueError("Python filters must be applied by the caller")
+        with self.connection() as connection:
+            cursor = self.cursor(connection)
+            try:
+                cursor.execute(f"SELECT {select} FROM user_data{where}", params)
+                names = tuple(description[0] for description in cursor.description)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield names, rows
+            finally:
+                cursor.close()
+
+
+class MySQLBackend(SQLBackend):
+    """
+    The ALX_prodev MySQL database, via the shared connection pool.
+    """
+    name = 'mysql'
+    Error = Error
+
+    def connection(self):
+        return db.connection()
+
+    def cursor(self, connection):
+        # Unbuffered: rows stay on the server until fetched
+        return connection.cursor(buffered=False)
+
+
+class SQLiteBackend(SQLBackend):
+    """
+    A user_data table in a local SQLite file.
+    WAL mode lets readers stream while a writer loads data.
+    """
+    name = 'sqlite'
+    placeholder = '?'
+    Error = sqlite3.Error
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('ALX_SQLITE_PATH', 'user_data.db')
+
+    @contextmanager
+    def connection(self):
+        # Async wrappers resume generators on different worker threads,
+        # one at a time, so the same-thread check can be relaxed
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL;")
+            yield connection
+        finally:
+            connection.close()
+
+    def load(self, rows, chunk_size=10_000):
+        """
+        Creates user_data if needed and inserts rows (dictionaries with
+        user_id, name, email and age), ignoring duplicate emails.
+        """
+        with self.connection() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS user_data (
+                    user_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL UNIQUE,
+                    age INTEGER NOT NULL
+                );
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_age ON user_data (age);")
+            batch = []
+            for row in rows:
+                batch.append((row['user_id'], row['name'], row['email'], row['age']))
+                if len(batch) == chunk_size:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO user_data VALUES (?, ?, ?, ?);", batch)
+                    batch = []
+            if batch:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO user_data VALUES (?, ?, ?, ?);", batch)
+            connection.commit()
+
+
+# ===============================================
+# Parquet backend
+# ===============================================
+
+ARROW_OPERATORS = {
+    '=': lambda field, value: field == value,
+    '!=': lambda field, value: field != value,
+    '<': lambda field, value: field < value,
+    '<=': lambda field, value: field <= value,
+    '>': lambda field, value: field > value,
+    '>=': lambda field, value: field >= value,
+    'IN': lambda field, value: field.isin(list(value)),
+    'LIKE': lambda field, value: pc.match_like(field, value),
+}
+
+
+class ParquetBackend:
+    """
+    user_data exported to a Parquet file, scanned with Arrow.
+    Projection and filters are pushed into the scan, so only the
+    needed columns and row groups are decoded.
+    """
+    name = 'parquet'
+    Error = OSError if pyarrow is None else (OSError, pyarrow.ArrowException)
+
+    def __init__(self, path=None):
+        if pyarrow is None:
+            raise RuntimeError("ParquetBackend requires pyarrow")
+        self.path = path or os.environ.get('ALX_PARQUET_PATH', 'user_data.parquet')
+
+    def scan(self, columns=None, filters=None, batch_size=1000):
+        compile_columns(columns)
+        expression = None
+        for item in filters or ():
+            if callable(item):
+                raise ValueError("Python filters must be applied by the caller")
+            column, operator = check_filter(item)
+            condition = ARROW_OPERATORS[operator](ds.field(column), item[2])
+            expression = condition if expression is None else expression & condition
+
+        dataset = ds.dataset(self.path, format='parquet')
+        for batch in dataset.to_batches(columns=list(columns) if columns else None,
+                                        filter=expression, batch_size=batch_size):
+            if batch.num_rows:
+                rows = list(zip(*(column.to_pylist() for column in batch.columns)))
+                yield tuple(batch.schema.names), rows
+
+    def load(self, rows, chunk_size=100_000):
+        """
+        Writes rows (dictionaries with user_id, name, email and age)
+        to the Parquet file, replacing it.
+        """
+        schema = pyarrow.schema([
+            ('user_id', pyarrow.string()),
+            ('name', pyarrow.string()),
+            ('email', pyarrow.string()),
+            ('age', pyarrow.int16()),
+        ])
+        with pq.ParquetWriter(self.path, schema) as writer:
+            batch = []
+            for row in rows:
+                batch.append({name: row[name] for name in schema.names})
+                if len(batch) == chunk_size:
+                    writer.write_table(pyarrow.Table.from_pylist(batch, schema))
+                    batch = []
+            if batch:
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema))
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+    'parquet': ParquetBackend,
+}
+
+
+def get_backend(backend=None):
+    """
+    Resolves a backend instance from an instance, a name, or ALX_BACKEND.
+    """
+    if backend is None:
+        backend = os.environ.get('ALX_BACKEND', 'mysql')
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend!r}")
+        return BACKENDS[backend]()
+    return backend
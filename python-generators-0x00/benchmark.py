@@ -0,0 +1,307 @@
+#!/usr/bin/python3
+"""
+Benchmarks for the python-generators-0x00 streaming functions.
+
+⚠️ Run against a scratch database: user_data is grown in place with
+synthetic users. Point the ALX_DB_* variables (see db.py) at a local
+MySQL instance used only for benchmarking, or pass --backend sqlite to
+run throughput and memory against a local SQLite file instead.
+
+Usage:
+    python3 benchmark.py throughput [--rows 100000] [--batch-sizes 10 100 1000 10000] [--backend mysql]
+    python3 benchmark.py memory [--sizes 10000 100000 1000000 10000000] [--backend mysql]
+    python3 benchmark.py columnar [--rows 1000000] [--batch-size 1000]
+    python3 benchmark.py backends [--rows 100000] [--backends mysql sqlite parquet]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import backends
+import columnar
+from synthetic_data import generate_users
+
+seed = __import__('seed')
+stream_users = __import__('0-stream_users').stream_users
+stream_users_in_batches = __import__('1-batch_processing').stream_users_in_batches
+batch_processing = __import__('1-batch_processing').batch_processing
+calculate_average_age = __import__('4-stream_ages').calculate_average_age
+
+# Each target takes a batch size and a backend name; batched targets
+# yield lists of rows
+TARGETS = {
+    'stream_users': lambda size, backend: stream_users(fetch_size=size, backend=backend),
+    'stream_users_in_batches': lambda size, backend: stream_users_in_batches(size, backend=backend),
+    'batch_processing': lambda size, backend: batch_processing(size, backend=backend),
+    'calculate_average_age': lambda size, backend: calculate_average_age(size, backend=backend),
+}
+BATCHED = ('stream_users_in_batches', 'batch_processing')
+
+
+# ===============================================
+# Helpers
+# ===============================================
+
+def peak_rss_mb():
+    """
+    Returns the peak resident set size of this process in MB.
+    """
+    # ru_maxrss is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def count_rows(connection):
+    """
+    Returns the number of rows currently in user_data.
+    """
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM user_data;")
+    (count,) = cursor.fetchone()
+    cursor.close()
+    return count
+
+
+def grow_table(size, random_seed=0):
+    """
+    Tops user_data up to at least `size` rows with synthetic users.
+    """
+    connection = seed.connect_to_prodev()
+    if not connection:
+        sys.exit(1)
+    seed.create_table(connection)
+    current = count_rows(connection)
+    if current < size:
+        users = generate_users(size - current, seed=random_seed, start=current)
+        seed.insert_data_bulk(connection, users, chunk_size=5000)
+    connection.close()
+
+
+# ===============================================
+# Measurements (each runs in a fresh child process)
+# ===============================================
+
+def measure(target, batch_size, backend='mysql'):
+    """
+    Child process: drains one target from `backend` and prints, on its
+    last line, rows, peak RSS MB, RSS growth MB, seconds and time to
+    first row.
+    """
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    first = None
+    rows = 0
+    if target == 'calculate_average_age':
+        TARGETS[target](batch_size, backend)
+    else:
+        for item in TARGETS[target](batch_size, backend):
+            if first is None:
+                first = time.perf_counter() - start
+            rows += len(item) if target in BATCHED else 1
+    elapsed = time.perf_counter() - start
+
+    if target == 'calculate_average_age':
+        # Not a generator: it returns once, after reading every row
+        first = elapsed
+        rows = sum(len(batch) for _, batch in
+                   backends.get_backend(backend).scan(columns=('age',)))
+    print(f"{rows} {peak_rss_mb():.1f} {peak_rss_mb() - baseline:.1f} "
+          f"{elapsed:.3f} {first if first is not None else elapsed:.4f}")
+
+
+def run_child(target, batch_size, backend='mysql'):
+    """
+    Runs measure() in a fresh process, so peak RSS doesn't carry over.
+    Returns (rows, peak MB, delta MB, seconds, time to first row).
+    """
+    output = subprocess.run(
+        [sys.executable, __file__, '_measure', target, str(batch_size),
+         '--backend', backend],
+        capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    # The figures are the last line of the child's output
+    rows, peak, delta, elapsed, first = output[-1].split()
+    return int(rows), float(peak), float(delta), float(elapsed), float(first)
+
+
+def throughput_benchmark(rows, batch_sizes, targets, random_seed=0, backend='mysql'):
+    """
+    Grows user_data in `backend` to `rows` and reports rows/sec, peak
+    memory and time to first row for every target and batch size.
+    """
+    load_backends(rows, [backend], random_seed)
+    print(f"{'target':>24} {'batch':>6} {'rows':>9} {'rows/sec':>10} "
+          f"{'peak MB':>8} {'first row ms':>13}")
+    for target in targets:
+        for batch_size in batch_sizes:
+            count, peak, _, elapsed, first = run_child(target, batch_size, backend)
+            rate = count / elapsed if elapsed else 0
+            print(f"{target:>24} {batch_size:>6} {count:>9} {rate:>10.0f} "
+                  f"{peak:>8.1f} {first * 1000:>13.1f}")
+
+
+def memory_benchmark(sizes, backend='mysql'):
+    """
+    Grows user_data in `backend` through each size and measures peak
+    RSS of a full stream_users scan in a fresh process.
+    """
+    print(f"{'rows':>10} {'peak RSS MB':>12} {'delta MB':>9} {'seconds':>8}")
+    for size in sorted(sizes):
+        load_backends(size, [backend])
+        rows, peak, delta, elapsed, _ = run_child('stream_users', 1000, backend)
+        print(f"{rows:>10} {peak:>12.1f} {delta:>9.1f} {elapsed:>8.2f}")
+
+
+# ===============================================
+# Row format benchmark
+# ===============================================
+
+COLUMNS = ('user_id', 'name', 'email', 'age')
+
+
+def raw_batches(rows, batch_size):
+    """
+    Yields cursor-like tuple batches of synthetic users.
+    """
+    batch = []
+    for i, user in enumerate(generate_users(rows)):
+        batch.append((f"{i:036d}", user['name'], user['email'], user['age']))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def filter_rows(batch, row_format):
+    """
+    Applies the batch_processing age filter in the given format.
+    """
+    if row_format == 'columnar':
+        return columnar.filter_older_than(batch)
+    if row_format == 'tuple':
+        return [user for user in batch if user.age > 25]
+    return [user for user in batch if user['age'] > 25]
+
+
+def columnar_benchmark(rows, batch_size):
+    """
+    Compares dict rows, namedtuple rows and columnar batches: peak
+    traced memory while holding every batch, and time to build and
+    filter them. Runs in memory, no database needed.
+    """
+    print(f"{rows} rows, batch size {batch_size}, "
+          f"NumPy {'on' if columnar.np is not None else 'off'}")
+    print(f"{'format':>9} {'peak MB':>8} {'build s':>8} {'filter s':>9}")
+    for row_format in columnar.ROW_FORMATS:
+        tracemalloc.start()
+        start = time.perf_counter()
+        batches = [columnar.format_batch(COLUMNS, raw, row_format)
+                   for raw in raw_batches(rows, batch_size)]
+        built = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for batch in batches:
+            filter_rows(batch, row_format)
+        filtered = time.perf_counter() - start
+        del batches
+        print(f"{row_format:>9} {peak / 2**20:>8.1f} {built:>8.2f} {filtered:>9.3f}")
+
+
+# ===============================================
+# Backend benchmark
+# ===============================================
+
+def load_backends(rows, names, random_seed=0):
+    """
+    Loads the same synthetic users into every requested backend.
+    """
+    if 'mysql' in names:
+        grow_table(rows, random_seed)
+    for name in names:
+        if name == 'mysql':
+            continue
+        users = (dict(user, user_id=seed.user_id_for(user['email']))
+                 for user in generate_users(rows, seed=random_seed))
+        backends.get_backend(name).load(users)
+
+
+def backend_benchmark(rows, names, batch_sizes, random_seed=0):
+    """
+    Runs batch_processing against each backend holding the same data
+    and reports rows/sec and time to first batch.
+    """
+    load_backends(rows, names, random_seed)
+    print(f"{'backend':>8} {'batch':>6} {'rows':>9} {'rows/sec':>10} {'first row ms':>13}")
+    for name in names:
+        backend = backends.get_backend(name)
+        for batch_size in batch_sizes:
+            start = time.perf_counter()
+            first = None
+            count = 0
+            for batch in batch_processing(batch_size, backend=backend):
+                if first is None:
+                    first = time.perf_counter() - start
+                count += len(batch)
+            elapsed = time.perf_counter() - start
+            rate = count / elapsed if elapsed else 0
+            print(f"{name:>8} {batch_size:>6} {count:>9} {rate:>10.0f} "
+                  f"{(first or elapsed) * 1000:>13.1f}")
+
+
+# ===============================================
+# Entry point
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    throughput = commands.add_parser('throughput', help="rows/sec, memory and first-row latency")
+    throughput.add_argument('--rows', type=int, default=100_000)
+    throughput.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 1000, 10_000])
+    throughput.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    throughput.add_argument('--seed', type=int, default=0)
+    throughput.add_argument('--backend', choices=list(backends.BACKENDS), default='mysql')
+
+    memory = commands.add_parser('memory', help="peak RSS of stream_users vs table size")
+    memory.add_argument('--sizes', type=int, nargs='+',
+                        default=[10_000, 100_000, 1_000_000, 10_000_000])
+    memory.add_argument('--backend', choices=list(backends.BACKENDS), default='mysql')
+
+    formats = commands.add_parser('columnar', help="dict rows vs columnar batches")
+    formats.add_argument('--rows', type=int, default=1_000_000)
+    formats.add_argument('--batch-size', type=int, default=1000)
+
+    stores = commands.add_parser('backends', help="batch_processing across storage backends")
+    stores.add_argument('--rows', type=int, default=100_000)
+    stores.add_argument('--backends', nargs='+', choices=list(backends.BACKENDS),
+                        default=list(backends.BACKENDS))
+    stores.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 10_000])
+    stores.add_argument('--seed', type=int, default=0)
+
+    child = commands.add_parser('_measure')
+    child.add_argument('target', choices=list(TARGETS))
+    child.add_argument('batch_size', type=int)
+    child.add_argument('--backend', choices=list(backends.BACKENDS), default='mysql')
+
+    args = parser.parse_args()
+    if args.command == 'throughput':
+        throughput_benchmark(args.rows, args.batch_sizes, args.targets, args.seed,
+                             args.backend)
+    elif args.command == 'memory':
+        memory_benchmark(args.sizes, args.backend)
+    elif args.command == 'columnar':
+        columnar_benchmark(args.rows, args.batch_size)
+    elif args.command == 'backends':
+        backend_benchmark(args.rows, args.backends, args.batch_sizes, args.seed)
+    elif args.command == '_measure':
+        measure(args.target, args.batch_size, args.backend)
+
+
+if __name__ == "__main__":
+    main()
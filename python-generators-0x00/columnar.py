@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Compact row and column formats for streamed user_data batches.
+
+Dict rows repeat every key string and carry a hash table per row.
+- Row tuples (namedtuple, no per-instance __dict__) keep one field
+  layout per batch.
+- ColumnBatch stores each column contiguously; numeric columns live
+  in `array` buffers that NumPy (when installed) can view without copying.
+"""
+from array import array
+from collections import namedtuple
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used
+    np = None
+
+# array typecodes for numeric columns (age is DECIMAL(3,0))
+NUMERIC_COLUMNS = {'age': 'h'}
+
+ROW_FORMATS = ('dict', 'tuple', 'columnar')
+
+_row_types = {}
+
+
+def row_type(columns):
+    """
+    Returns a cached namedtuple class for the given column names.
+    """
+    columns = tuple(columns)
+    if columns not in _row_types:
+        _row_types[columns] = namedtuple('UserRow', columns)
+    return _row_types[columns]
+
+
+class ColumnBatch:
+    """
+    A batch of users stored column by column.
+    batch['age'] is an array('h'); string columns are lists.
+    """
+    __slots__ = ('columns', 'data')
+
+    def __init__(self, columns, data):
+        self.columns = tuple(columns)
+        self.data = data
+
+    @classmethod
+    def from_rows(cls, columns, rows):
+        """Builds a batch from an iterable of row tuples."""
+        columns = tuple(columns)
+        data = {
+            column: array(NUMERIC_COLUMNS[column]) if column in NUMERIC_COLUMNS else []
+            for column in columns
+        }
+        targets = [data[column] for column in columns]
+        numeric = [column in NUMERIC_COLUMNS for column in columns]
+        for row in rows:
+            for target, is_numeric, value in zip(targets, numeric, row):
+                target.append(int(value) if is_numeric else value)
+        return cls(columns, data)
+
+    def __len__(self):
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def __getitem__(self, column):
+        return self.data[column]
+
+    def as_numpy(self, column):
+        """Zero-copy NumPy view of a numeric column (requires NumPy)."""
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.data[column], dtype=self.data[column].typecode)
+
+    def compress(self, mask):
+        """Returns a new batch keeping the rows where mask is true."""
+        mask = list(mask)
+        data = {}
+        for column in self.columns:
+            values = self.data[column]
+            kept = compress(values, mask)
+            data[column] = array(values.typecode, kept) if isinstance(values, array) else list(kept)
+        return ColumnBatch(self.columns, data)
+
+    def rows(self):
+        """Iterates the batch as row tuples."""
+        return map(row_type(self.columns)._make,
+                   zip(*(self.data[column] for column in self.columns)))
+
+
+def format_batch(columns, rows, row_format):
+    """
+    Converts raw cursor tuples into the requested row format:
+    'dict', 'tuple' (namedtuples) or 'columnar' (ColumnBatch).
+    """
+    if row_format == 'columnar':
+        return ColumnBatch.from_rows(columns, rows)
+    if row_format == 'tuple':
+        return list(map(row_type(columns)._make, rows))
+    if row_format == 'dict':
+        return [dict(zip(columns, row)) for row in rows]
+    raise ValueError(f"Unknown row format: {row_format!r}")
+
+
+# ===============================================
+# Vectorised age filter
+# ===============================================
+
+def age_mask(batch, minimum=25):
+    """
+    Boolean mask of users older than `minimum` in a ColumnBatch.
+    Uses NumPy when available, otherwise a single pass over the array.
+    """
+    if np is not None:
+        return batch.as_numpy('age') > minimum
+    return [age > minimum for age in batch['age']]
+
+
+def filter_older_than(batch, minimum=25):
+    """
+    Columnar equivalent of batch_processing's `age > 25` filter.
+    """
+    return batch.compress(age_mask(batch, minimum))
@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+"""
+Shared MySQL connection pool for the python-generators-0x00 modules.
+
+Settings come from the environment (defaults in brackets):
+    ALX_DB_HOST [localhost]        ALX_DB_PORT [3306]
+    ALX_DB_USER [root]             ALX_DB_PASSWORD [your_password]
+    ALX_DB_NAME [ALX_prodev]       ALX_DB_POOL_SIZE [5]
+    ALX_DB_MAX_LIFETIME [3600]     seconds before a connection is recycled
+    ALX_DB_HEALTH_CHECK [30]       idle seconds before a connection is pinged
+
+Usage:
+    import db
+
+    with db.connection() as connection:
+        cursor = connection.cursor()
+        ...
+"""
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error
+
+
+def load_config():
+    """
+    Reads the connection settings from the environment.
+    """
+    return {
+        'host': os.environ.get('ALX_DB_HOST', 'localhost'),
+        'port': int(os.environ.get('ALX_DB_PORT', '3306')),
+        'user': os.environ.get('ALX_DB_USER', 'root'),
+        'password': os.environ.get('ALX_DB_PASSWORD', 'your_password'),
+        'database': os.environ.get('ALX_DB_NAME', 'ALX_prodev'),
+        'pool_size': int(os.environ.get('ALX_DB_POOL_SIZE', '5')),
+        'max_lifetime': float(os.environ.get('ALX_DB_MAX_LIFETIME', '3600')),
+        'health_check': float(os.environ.get('ALX_DB_HEALTH_CHECK', '30')),
+    }
+
+
+class PooledConnection:
+    """
+    Proxy around a mysql.connector connection borrowed from a pool.
+    Everything is delegated to the real connection, except close(),
+    which hands it back to the pool instead of closing the socket.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self.borrowed = False
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        # Closing twice (explicitly and via a with block) is harmless
+        if self.borrowed:
+            self.borrowed = False
+            self._pool.release(self)
+
+
+class ConnectionPool:
+    """
+    A bounded pool of MySQL connections.
+
+    - size: maximum number of open connections; acquire() blocks when
+      all of them are borrowed.
+    - max_lifetime: connections older than this are closed and replaced.
+    - health_check: connections idle longer than this are pinged before
+      being handed out; dead ones are replaced.
+    """
+
+    def __init__(self, size=5, max_lifetime=3600, health_check=30, **connect_args):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        # Unbuffered generators may stop early; drain their rows on release
+        self.connect_args = {'consume_results': True, **connect_args}
+        self._idle = []  # most recently returned last
+        self._opened = 0
+        # Signalled whenever a connection is returned or a slot frees up
+        self._available = threading.Condition()
+
+    def _open(self):
+        return PooledConnection(self, mysql.connector.connect(**self.connect_args))
+
+    def _discard(self, connection):
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+        try:
+            connection._raw.close()
+        except Error:
+            pass
+
+    def _usable(self, connection):
+        now = time.monotonic()
+        if now - connection.created_at > self.max_lifetime:
+            return False
+        if now - connection.returned_at > self.health_check:
+            try:
+                connection._raw.ping(reconnect=False)
+            except Error:
+                return False
+        return True
+
+    def acquire(self, timeout=None):
+        """
+        Borrows a connection, opening one if the pool is not full yet.
+        Raises queue.Empty if none frees up within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while not self._idle and self._opened >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty("no MySQL connection available")
+                    self._available.wait(remaining)
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    self._opened += 1
+                    connection = None
+
+            if connection is None:
+                try:
+                    connection = self._open()
+                except Error:
+                    with self._available:
+                        self._opened -= 1
+                        self._available.notify()
+                    raise
+                connection.borrowed = True
+                return connection
+
+            if self._usable(connection):
+                connection.borrowed = True
+                return connection
+            self._discard(connection)
+
+    def release(self, connection):
+        """
+        Returns a connection to the pool, rolling back any open transaction.
+        """
+        try:
+            if connection._raw.in_transaction:
+                connection._raw.rollback()
+        except Error:
+            self._discard(connection)
+            return
+        connection.returned_at = time.monotonic()
+        with self._available:
+            self._idle.append(connection)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager that borrows a connection and always returns it.
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def closeall(self):
+        """
+        Closes every idle connection.
+        """
+        with self._available:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(**overrides):
+    """
+    Returns the shared pool for the configured settings plus overrides,
+    e.g. get_pool(database=None) for a server-level connection.
+    """
+    config = {**load_config(), **overrides}
+    pool_args = {key: config.pop(key) for key in ('pool_size', 'max_lifetime', 'health_check')}
+    connect_args = {key: value for key, value in config.items() if value is not None}
+    key = tuple(sorted(connect_args.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                size=pool_args['pool_size'],
+                max_lifetime=pool_args['max_lifetime'],
+                health_check=pool_args['health_check'],
+                **connect_args
+            )
+        return _pools[key]
+
+
+def connection(timeout=None, **overrides):
+    """
+    Borrows a connection from the shared pool as a context manager.
+    """
+    return get_pool(**overrides).connection(timeout)
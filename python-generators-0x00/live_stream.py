@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Live (tailing) stream of user_data.
+
+stream_users_live() yields the current table as a snapshot, then keeps
+yielding rows as they are inserted or updated. It reads only rows past an
+(updated_at, user_id) watermark through the idx_updated_at index, so no
+poll ever re-scans the table. Empty polls back off exponentially.
+"""
+import time
+
+from mysql.connector import Error
+
+import db
+
+
+def poll_changes(after, batch_size, settle):
+    """
+    Returns up to batch_size rows changed after the watermark, oldest first.
+    Rows newer than `settle` seconds are left for the next poll, so a
+    transaction that commits rows stamped before the watermark is not
+    skipped, provided it commits within `settle` seconds.
+    """
+    conditions = ["updated_at <= NOW(6) - INTERVAL %s MICROSECOND"]
+    params = [int(settle * 1_000_000)]
+    if after is not None:
+        conditions.append("(updated_at, user_id) > (%s, %s)")
+        params.extend(after)
+
+    with db.connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT * FROM user_data WHERE {' AND '.join(conditions)} "
+            "ORDER BY updated_at, user_id LIMIT %s;",
+            (*params, batch_size)
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+
+def stream_users_live(after=None, batch_size=1000, min_interval=0.1,
+                      max_interval=5.0, settle=1.0, idle_timeout=None):
+    """
+    Generator that yields user rows as dictionaries, forever.
+
+    - after: (updated_at, user_id) watermark to resume from; None starts
+      with a full snapshot. Every row carries its updated_at, so
+      (row['updated_at'], row['user_id']) is a resume token.
+    - min_interval / max_interval: poll delay bounds in seconds; the delay
+      doubles after each empty poll and resets when rows arrive.
+    - settle: seconds a change must age before it is read. updated_at is
+      set when a statement runs, not when it commits, so this is a
+      heuristic: it must exceed the longest write transaction on the
+      table, or rows from that transaction can be skipped. Raise it when
+      tailing during bulk loads (ingest_csv commits every commit_every
+      chunks, which can take several seconds).
+    - idle_timeout: stop after this many seconds without changes.
+    """
+    watermark = after
+    interval = min_interval
+    idle_since = time.monotonic()
+    while True:
+        try:
+            rows = poll_changes(watermark, batch_size, settle)
+        except Error as e:
+            print(f"❌ Database error: {e}")
+            rows = []
+
+        if rows:
+            last = rows[-1]
+            watermark = (last['updated_at'], last['user_id'])
+            interval = min_interval
+            idle_since = time.monotonic()
+            yield from rows
+            if len(rows) == batch_size:
+                continue  # More rows are waiting; don't sleep
+
+        if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+            return
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
+
+
+# ===============================
+# Example usage
+# ===============================
+if __name__ == "__main__":
+    for user in stream_users_live():
+        print(user)
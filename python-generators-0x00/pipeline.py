@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""
+Multi-process pipeline over batch_processing().
+
+parallel_batch_processing() is a drop-in replacement for batch_processing():
+it yields the same filtered batches, but runs a per-user transform on a
+process pool. At most `max_pending` batches are in flight, so a slow
+consumer or slow workers apply backpressure to the database stream.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+batch_processing = __import__('1-batch_processing').batch_processing
+
+
+class StageStats:
+    """
+    Item count and busy time for one pipeline stage.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+    def record(self, rows, seconds):
+        self.batches += 1
+        self.rows += rows
+        self.seconds += seconds
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"{self.name}: {self.rows} rows in {self.batches} batches, "
+                f"{self.seconds:.2f}s busy ({self.rows_per_sec:.0f} rows/sec)")
+
+
+class PipelineStats:
+    """
+    Per-stage throughput: fetch (database), transform (workers, summed
+    across processes) and consume (time the caller spends per batch).
+    """
+
+    def __init__(self):
+        self.fetch = StageStats('fetch')
+        self.transform = StageStats('transform')
+        self.consume = StageStats('consume')
+
+    def __repr__(self):
+        return "\n".join(repr(stage) for stage in (self.fetch, self.transform, self.consume))
+
+
+def transform_batch(transform, batch):
+    """
+    Worker side: applies the transform to every user in the batch.
+    Returns the transformed batch and the time spent.
+    """
+    start = time.perf_counter()
+    result = [transform(user) for user in batch]
+    return result, time.perf_counter() - start
+
+
+def parallel_batch_processing(batch_size=10, transform=None, workers=None,
+                              max_pending=None, ordered=True, stats=None, backend=None):
+    """
+    Generator that shards batch_processing() output across a process pool.
+
+    - transform: picklable (module-level) function applied to each user;
+      batches pass through unchanged when None.
+    - workers: pool size (defaults to the CPU count).
+    - max_pending: batches in flight before fetching pauses
+      (defaults to twice the pool size).
+    - ordered: yield batches in database order; when False, yield
+      whichever batch finishes first.
+    - stats: optional PipelineStats filled in as the pipeline runs.
+    - backend: store to read from, as for batch_processing().
+    """
+    stats = stats if stats is not None else PipelineStats()
+    source = batch_processing(batch_size, backend=backend)
+
+    if transform is None:
+        for batch in timed_fetch(source, stats):
+            yield from timed_consume([batch], stats)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        batches = timed_fetch(source, stats)
+
+        def collect(future):
+            result, seconds = future.result()
+            stats.transform.record(len(result), seconds)
+            return result
+
+        exhausted = False
+        while pending or not exhausted:
+            # Fill the pipeline up to the backpressure limit
+            while not exhausted and len(pending) < max_pending:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                else:
+                    pending.append(pool.submit(transform_batch, transform, batch))
+
+            if not pending:
+                break
+
+            if ordered:
+                yield from timed_consume([collect(pending.popleft())], stats)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                yield from timed_consume([collect(future) for future in done], stats)
+
+
+def timed_fetch(source, stats):
+    """
+    Pulls batches from the source, recording fetch time.
+    """
+    while True:
+        start = time.perf_counter()
+        batch = next(source, None)
+        if batch is None:
+            return
+        stats.fetch.record(len(batch), time.perf_counter() - start)
+        yield batch
+
+
+def timed_consume(results, stats):
+    """
+    Yields results, recording how long the caller holds each one.
+    """
+    for result in results:
+        start = time.perf_counter()
+        yield result
+        stats.consume.record(len(result), time.perf_counter() - start)
+
+
+# ===============================
+# Example usage
+# ===============================
+def describe(user):
+    return f"{user['name']} ({user['age']})"
+
+
+if __name__ == "__main__":
+    pipeline_stats = PipelineStats()
+    for described in parallel_batch_processing(batch_size=100, transform=describe,
+                                               stats=pipeline_stats):
+        print(described)
+    print(pipeline_stats)
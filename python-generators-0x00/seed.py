@@ -1,8 +1,16 @@
-import mysql.connector
 from mysql.connector import Error
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import csv
+import hashlib
+import math
+import mmap
+import os
+import time
 import uuid
 
+import db
+
 # ===============================================
 # Database Connection Functions
 # ===============================================
@@ -10,14 +18,11 @@ import uuid
 def connect_db():
     """
     Connects to the MySQL server (not a specific database).
-    Returns a connection object if successful.
+    Returns a pooled connection object if successful; close() returns it
+    to the shared pool.
     """
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='ALX_prodev',          
-            password='root' 
-        )
+        connection = db.get_pool(database=None).acquire()
         if connection.is_connected():
             print("✅ Connected to MySQL server.")
             return connection
@@ -38,18 +43,15 @@ def create_database(connection):
         print(f"❌ Error creating database: {e}")
 
 
-def connect_to_prodev():
+def connect_to_prodev(allow_local_infile=False):
     """
     Connects to the ALX_prodev database.
-    Returns a connection object.
+    Pass allow_local_infile=True to enable LOAD DATA LOCAL INFILE.
+    Returns a pooled connection object; close() returns it to the pool.
     """
+    options = {'allow_local_infile': True} if allow_local_infile else {}
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='ALX_prodev',
-            password='root',
-            database='ALX_prodev'
-        )
+        connection = db.get_pool(**options).acquire()
         if connection.is_connected():
             print("✅ Connected to database: ALX_prodev")
             return connection
@@ -70,15 +72,81 @@ def create_table(connection):
                 name VARCHAR(255) NOT NULL,
                 email VARCHAR(255) NOT NULL UNIQUE,
                 age DECIMAL(3,0) NOT NULL,
-                INDEX idx_user_id (user_id)
+                created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+                    ON UPDATE CURRENT_TIMESTAMP(6),
+                INDEX idx_user_id (user_id),
+                INDEX idx_age (age),
+                INDEX idx_created_at (created_at, user_id),
+                INDEX idx_updated_at (updated_at, user_id)
             );
         """)
         connection.commit()
         print("✅ Table 'user_data' created or already exists.")
+        create_age_index(connection)
+        add_watermark_columns(connection)
     except Error as e:
         print(f"❌ Error creating table: {e}")
 
 
+def create_age_index(connection):
+    """
+    Adds the idx_age index to a user_data table created before it existed,
+    so age filters pushed down to SQL don't need a full table scan.
+    """
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+              AND table_name = 'user_data'
+              AND index_name = 'idx_age';
+        """)
+        (exists,) = cursor.fetchone()
+        if not exists:
+            cursor.execute("CREATE INDEX idx_age ON user_data (age);")
+            connection.commit()
+            print("✅ Index 'idx_age' created on user_data.")
+    except Error as e:
+        print(f"❌ Error creating index: {e}")
+
+
+# Indexed timestamp columns used as watermarks:
+# created_at for incremental aggregation, updated_at for live streaming
+WATERMARK_COLUMNS = {
+    'created_at': "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)",
+    'updated_at': "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) "
+                  "ON UPDATE CURRENT_TIMESTAMP(6)",
+}
+
+
+def add_watermark_columns(connection):
+    """
+    Adds the indexed created_at/updated_at columns to a user_data table
+    created before they existed.
+    """
+    try:
+        cursor = connection.cursor()
+        for column, definition in WATERMARK_COLUMNS.items():
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = DATABASE()
+                  AND table_name = 'user_data'
+                  AND column_name = %s;
+            """, (column,))
+            (exists,) = cursor.fetchone()
+            if not exists:
+                cursor.execute(f"""
+                    ALTER TABLE user_data
+                    ADD COLUMN {column} {definition},
+                    ADD INDEX idx_{column} ({column}, user_id);
+                """)
+                connection.commit()
+                print(f"✅ Column '{column}' added to user_data.")
+    except Error as e:
+        print(f"❌ Error adding watermark columns: {e}")
+
+
 # ===============================================
 # Data Insertion
 # ===============================================
@@ -129,6 +197,368 @@ def load_csv_data(filename):
     return data
 
 
+# ===============================================
+# Streaming Bulk Ingestion
+# ===============================================
+
+def stream_csv_data(filename):
+    """
+    Lazily yields user rows from the CSV one at a time,
+    so memory stays bounded no matter how large the file is.
+    """
+    with open(filename, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield {
+                'name': row['name'],
+                'email': row['email'],
+                'age': row['age']
+            }
+
+
+def chunked(rows, chunk_size):
+    """
+    Groups any iterable of rows into lists of at most chunk_size items.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ===============================================
+# Deterministic Ids and Deduplication
+# ===============================================
+
+# Namespace for UUIDv5 user ids: the same email always gets the same id
+USER_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, 'user_data.ALX_prodev')
+
+
+def user_id_for(email):
+    """
+    Returns the deterministic UUIDv5 user_id for an email address.
+    """
+    return str(uuid.uuid5(USER_ID_NAMESPACE, email.strip().lower()))
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for email keys.
+    May report a key it hasn't seen (false positive), never the reverse.
+    """
+
+    def __init__(self, expected_items, error_rate=0.001):
+        expected_items = max(expected_items, 1)
+        self.size = max(8, int(-expected_items * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        """Adds a key; returns True if it was (probably) present already."""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+
+def insert_data_bulk(connection, rows, chunk_size=1000, commit_every=10):
+    """
+    Inserts rows with multi-row INSERT IGNORE batches.
+    The UNIQUE email index skips duplicates, so re-runs are safe.
+    Commits every `commit_every` chunks and reports throughput.
+    Returns the number of rows actually inserted.
+    """
+    insert_query = """
+        INSERT IGNORE INTO user_data (user_id, name, email, age)
+        VALUES (%s, %s, %s, %s);
+    """
+    processed = 0
+    inserted = 0
+    start = time.perf_counter()
+    try:
+        cursor = connection.cursor()
+        for index, chunk in enumerate(chunked(rows, chunk_size), start=1):
+            cursor.executemany(insert_query, [
+                (user_id_for(row['email']), row['name'], row['email'], row['age'])
+                for row in chunk
+            ])
+            processed += len(chunk)
+            inserted += max(cursor.rowcount, 0)
+            if index % commit_every == 0:
+                connection.commit()
+                elapsed = time.perf_counter() - start
+                print(f"⏳ {processed} rows processed ({processed / elapsed:.0f} rows/sec)")
+        connection.commit()
+        cursor.close()
+    except Error as e:
+        print(f"❌ Error inserting data: {e}")
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0
+    print(f"✅ {inserted}/{processed} rows inserted in {elapsed:.2f}s ({rate:.0f} rows/sec).")
+    return inserted
+
+
+def upsert_data(connection, rows, chunk_size=1000, commit_every=10,
+                dedupe='set', expected_rows=None):
+    """
+    Upserts rows keyed by email with deterministic UUIDv5 ids, so
+    reloading the same file is fast and keeps every user_id stable.
+
+    Duplicate emails within the input keep their first occurrence:
+    - dedupe='set': an exact in-memory set of seen emails drops repeats.
+    - dedupe='bloom': a Bloom filter sized for `expected_rows` bounds
+      memory on huge files. Rows it flags go through INSERT IGNORE, so a
+      false positive still gets inserted and a true repeat is skipped.
+    All other rows use INSERT ... ON DUPLICATE KEY UPDATE on the UNIQUE
+    email index. Returns the number of rows sent to the database.
+    """
+    upsert_query = """
+        INSERT INTO user_data (user_id, name, email, age)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE name = VALUES(name), age = VALUES(age);
+    """
+    ignore_query = """
+        INSERT IGNORE INTO user_data (user_id, name, email, age)
+        VALUES (%s, %s, %s, %s);
+    """
+    if dedupe == 'bloom':
+        seen = BloomFilter(expected_rows or 10_000_000)
+    elif dedupe == 'set':
+        seen = set()
+    else:
+        raise ValueError(f"Unknown dedupe mode: {dedupe!r}")
+
+    processed = 0
+    sent = 0
+    skipped = 0
+    start = time.perf_counter()
+    try:
+        cursor = connection.cursor()
+        for index, chunk in enumerate(chunked(rows, chunk_size), start=1):
+            fresh = []
+            repeats = []
+            for row in chunk:
+                email = row['email'].strip().lower()
+                if dedupe == 'bloom':
+                    target = repeats if seen.add(email) else fresh
+                elif email in seen:
+                    skipped += 1
+                    continue
+                else:
+                    seen.add(email)
+                    target = fresh
+                target.append((user_id_for(email), row['name'], row['email'], row['age']))
+
+            if fresh:
+                cursor.executemany(upsert_query, fresh)
+            if repeats:
+                cursor.executemany(ignore_query, repeats)
+            processed += len(chunk)
+            sent += len(fresh) + len(repeats)
+            if index % commit_every == 0:
+                connection.commit()
+                elapsed = time.perf_counter() - start
+                print(f"⏳ {processed} rows processed ({processed / elapsed:.0f} rows/sec)")
+        connection.commit()
+        cursor.close()
+    except Error as e:
+        print(f"❌ Error upserting data: {e}")
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0
+    print(f"✅ {sent}/{processed} rows sent, {skipped} in-file duplicates skipped "
+          f"in {elapsed:.2f}s ({rate:.0f} rows/sec).")
+    return sent
+
+
+def load_data_infile(connection, filename):
+    """
+    Loads the CSV with LOAD DATA LOCAL INFILE, the fastest path MySQL offers.
+    The connection must be opened with allow_local_infile=True and the
+    server must have local_infile enabled. Returns the number of rows loaded.
+    New rows get random UUID() ids, not the deterministic user_id_for()
+    ids the other load paths use, so reloads through other paths won't
+    match them by id (duplicates are still skipped by the email index).
+    """
+    with open(filename, mode='r', encoding='utf-8', newline='') as file:
+        header = next(csv.reader(file), [])
+
+    # Map known CSV columns, discard any others into user variables
+    columns = [
+        name if name in ('name', 'email', 'age') else '@skip'
+        for name in header
+    ]
+    load_query = f"""
+        LOAD DATA LOCAL INFILE %s
+        IGNORE INTO TABLE user_data
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '\\n'
+        IGNORE 1 LINES
+        ({', '.join(columns)})
+        SET user_id = UUID();
+    """
+    start = time.perf_counter()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(load_query, (filename,))
+        loaded = cursor.rowcount
+        connection.commit()
+        cursor.close()
+    except Error as e:
+        print(f"❌ Error loading data: {e}")
+        return 0
+
+    elapsed = time.perf_counter() - start
+    rate = loaded / elapsed if elapsed > 0 else 0
+    print(f"✅ {loaded} rows loaded in {elapsed:.2f}s ({rate:.0f} rows/sec).")
+    return loaded
+
+
+# ===============================================
+# Parallel CSV Parsing
+# ===============================================
+
+def csv_chunk_offsets(filename, chunk_bytes=16 * 1024 * 1024):
+    """
+    Memory-maps the CSV and splits it into byte ranges ending on line
+    boundaries. Returns the header fields and a list of (start, end).
+    Assumes quoted fields don't contain newlines.
+    """
+    with open(filename, mode='rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return [], []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            header_end = mapped.find(b'\n') + 1 or len(mapped)
+            header = next(csv.reader([mapped[:header_end].decode('utf-8')]), [])
+            offsets = []
+            start = header_end
+            while start < len(mapped):
+                end = mapped.find(b'\n', min(start + chunk_bytes, len(mapped)) - 1)
+                end = len(mapped) if end == -1 else end + 1
+                offsets.append((start, end))
+                start = end
+    return header, offsets
+
+
+def parse_csv_chunk(filename, header, start, end):
+    """
+    Worker side: parses one byte range of the CSV.
+    Returns (rows, rejects): rows have a stripped name/email and an int age;
+    rejects are (byte offset, reason, raw line) for malformed rows.
+    """
+    with open(filename, mode='rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    rows = []
+    rejects = []
+    offset = start
+    # Split on b'\n' only: str.splitlines() would also break lines at
+    # characters such as U+2028 or \x0c that may appear inside a field
+    for raw in data.split(b'\n'):
+        line_offset = offset
+        offset += len(raw) + 1
+        line = raw.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            fields = next(csv.reader([line]))
+            if len(fields) != len(header):
+                raise ValueError(f"expected {len(header)} fields, got {len(fields)}")
+            record = dict(zip(header, fields))
+            name = record['name'].strip()
+            email = record['email'].strip()
+            age = int(record['age'])
+            if not name or not email:
+                raise ValueError("empty name or email")
+            if not 0 <= age <= 999:  # age is DECIMAL(3,0)
+                raise ValueError(f"age out of range: {age}")
+        except (csv.Error, KeyError, ValueError) as e:
+            rejects.append((line_offset, str(e), line.rstrip('\r\n')))
+            continue
+        rows.append({'name': name, 'email': email, 'age': age})
+    return rows, rejects
+
+
+def load_csv_parallel(filename, workers=None, chunk_bytes=16 * 1024 * 1024, quarantine=None):
+    """
+    Generator that parses the CSV in a process pool and yields typed
+    batches (one per chunk, in file order). Malformed rows don't abort the
+    load: they are written to the quarantine CSV (default
+    `<filename>.rejected.csv`) with their byte offset and reason.
+    """
+    quarantine = quarantine or f"{filename}.rejected.csv"
+    header, offsets = csv_chunk_offsets(filename, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+    rejected = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(quarantine, mode='w', encoding='utf-8', newline='') as rejects_file:
+        writer = csv.writer(rejects_file)
+        writer.writerow(('offset', 'reason', 'line'))
+        pending = deque()
+        chunks = iter(offsets)
+        while True:
+            # Keep at most two chunks per worker in flight
+            for start, end in chunks:
+                pending.append(pool.submit(parse_csv_chunk, filename, header, start, end))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            rows, rejects = pending.popleft().result()
+            writer.writerows(rejects)
+            rejected += len(rejects)
+            if rows:
+                yield rows
+
+    if rejected:
+        print(f"⚠️ {rejected} malformed rows quarantined in {quarantine}.")
+    else:
+        os.remove(quarantine)
+
+
+def ingest_csv(connection, filename, chunk_size=1000, commit_every=10,
+               use_load_data=False, parallel=False, workers=None,
+               upsert=False, dedupe='set'):
+    """
+    Streams the CSV into user_data without materialising it in memory.
+    Uses LOAD DATA LOCAL INFILE when requested, otherwise chunked INSERT IGNORE
+    (or upsert_data with upsert=True). LOAD DATA assigns random ids, so it
+    can't be combined with upsert=True.
+    With parallel=True, the CSV is parsed and validated by load_csv_parallel.
+    """
+    if use_load_data:
+        if upsert:
+            raise ValueError("use_load_data doesn't give stable ids; it can't be used with upsert=True")
+        return load_data_infile(connection, filename)
+    try:
+        if parallel:
+            rows = (row for batch in load_csv_parallel(filename, workers) for row in batch)
+        else:
+            rows = stream_csv_data(filename)
+        if upsert:
+            return upsert_data(connection, rows, chunk_size, commit_every, dedupe)
+        return insert_data_bulk(connection, rows, chunk_size, commit_every)
+    except FileNotFoundError:
+        print(f"❌ Error: File {filename} not found.")
+        return 0
+
+
 # ===============================================
 # Main Script Execution
 # ===============================================
@@ -151,11 +581,8 @@ def main():
     # Step 4: Create table if not exists
     create_table(db_conn)
 
-    # Step 5: Load data from CSV
-    csv_data = load_csv_data('user_data.csv')
-
-    # Step 6: Insert data into table
-    insert_data(db_conn, csv_data)
+    # Step 5 & 6: Stream the CSV into the table in chunked batches
+    ingest_csv(db_conn, 'user_data.csv')
 
     # Step 7: Close connection
     db_conn.close()
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Deterministic synthetic user_data for load testing.
+
+The same seed always produces the same users, so benchmark runs are
+comparable. Ages follow a uniform or normal distribution, clipped to
+[age_min, age_max].
+
+Usage:
+    python3 synthetic_data.py user_data.csv --rows 1000000 --seed 42 \\
+        --distribution normal --age-mean 40 --age-stddev 12
+"""
+import argparse
+import csv
+import random
+
+DISTRIBUTIONS = ('uniform', 'normal')
+
+
+def generate_users(count, seed=0, start=0, distribution='uniform',
+                   age_min=18, age_max=100, age_mean=40, age_stddev=12):
+    """
+    Yields `count` fake users as dictionaries with name, email and age.
+    Users are numbered from `start`, so emails stay unique when a table
+    is grown in several steps.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution!r}")
+    rng = random.Random(f"{seed}:{start}")
+    for i in range(start, start + count):
+        if distribution == 'normal':
+            age = round(rng.gauss(age_mean, age_stddev))
+            age = min(max(age, age_min), age_max)
+        else:
+            age = rng.randint(age_min, age_max)
+        yield {
+            'name': f"User {i}",
+            'email': f"user{i}@synthetic.example",
+            'age': age
+        }
+
+
+def write_csv(filename, count, **options):
+    """
+    Writes synthetic users to a CSV that seed.py can load.
+    """
+    with open(filename, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=('name', 'email', 'age'))
+        writer.writeheader()
+        writer.writerows(generate_users(count, **options))
+    print(f"✅ Wrote {count} synthetic users to {filename}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic user_data CSV.")
+    parser.add_argument('filename')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--age-min', type=int, default=18)
+    parser.add_argument('--age-max', type=int, default=100)
+    parser.add_argument('--age-mean', type=float, default=40)
+    parser.add_argument('--age-stddev', type=float, default=12)
+    args = parser.parse_args()
+
+    write_csv(args.filename, args.rows, seed=args.seed, distribution=args.distribution,
+              age_min=args.age_min, age_max=args.age_max,
+              age_mean=args.age_mean, age_stddev=args.age_stddev)
+
+
+if __name__ == "__main__":
+    main()